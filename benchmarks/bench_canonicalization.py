@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Benchmark streaming body canonicalization against whole-buffer canonicalization."""
+
+import hashlib
+import os
+import sys
+import time
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "tests")]
+# the whole-buffer implementations are the test oracle
+# pylint: disable=wrong-import-position
+from module_name.dkim import canonicalization  # noqa: E402
+from test_dkim_canonicalization import WHOLE  # noqa: E402
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    body = b"Lorem ipsum  dolor\t sit amet   \r\n" * size + b"\r\n\r\n"
+    chunk_size = 64 * 1024
+    print(f"body: {len(body)} bytes, chunks of {chunk_size} bytes")
+    for name, whole in sorted(WHOLE.items()):
+        start = time.perf_counter()
+        expected = hashlib.sha256(whole(body)).digest()
+        whole_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        chunks = (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+        digest = canonicalization.body_hash(chunks, name, 'sha256')
+        stream_time = time.perf_counter() - start
+
+        assert digest == expected
+        print(f"{name:<8} whole-buffer {whole_time:8.3f}s  streaming {stream_time:8.3f}s")
+
+
+if __name__ == '__main__':
+    main()
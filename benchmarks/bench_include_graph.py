@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark IncludeGraph with many customer domains including a few hundred providers."""
+
+import os
+import random
+import sys
+import time
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# pylint: disable=wrong-import-position
+from module_name.spf.include_graph import IncludeGraph  # noqa: E402
+
+
+PROVIDERS = 300
+# the first providers include no others
+LEAF_PROVIDERS = 30
+TEMPLATES = 2000
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    path = sys.argv[2] if len(sys.argv) > 2 else None
+    if path is not None and os.path.exists(path):
+        os.remove(path)
+    rng = random.Random(5)
+
+    providers = {}
+    for i in range(PROVIDERS):
+        terms = [f"ip4:10.{i}.{k}.0/24" for k in range(4)] + [f"ip6:2001:db8:{i:x}::/48"]
+        if i >= LEAF_PROVIDERS:
+            terms += [f"include:p{rng.randrange(LEAF_PROVIDERS)}.example" for _ in range(2)]
+        providers[f"p{i}.example"] = "v=spf1 " + " ".join(terms)
+    # customers publish one of relatively few distinct records
+    templates = [f"v=spf1 include:p{rng.randrange(PROVIDERS)}.example "
+                 f"include:p{rng.randrange(PROVIDERS)}.example mx" for _ in range(TEMPLATES)]
+    customers = [f"c{i}.example" for i in range(count)]
+
+    graph = IncludeGraph(path)
+    start = time.perf_counter()
+    graph.update_many(providers.items())
+    graph.update_many((domain, rng.choice(templates)) for domain in customers)
+    print(f"load:           {time.perf_counter() - start:8.2f} s")
+
+    for title in ("cold summaries", "memoized"):
+        start = time.perf_counter()
+        for domain in customers:
+            graph.summary(domain)
+        print(f"{title + ':':<16}{time.perf_counter() - start:8.2f} s")
+
+    start = time.perf_counter()
+    graph.update(f"p{LEAF_PROVIDERS // 2}.example", "v=spf1 ip4:192.0.2.0/24 a")
+    print(f"provider update:{(time.perf_counter() - start) * 1e3:8.2f} ms")
+    start = time.perf_counter()
+    for domain in customers:
+        graph.summary(domain)
+    print(f"re-summarize:   {time.perf_counter() - start:8.2f} s")
+    graph.close()
+
+    if path is not None:
+        start = time.perf_counter()
+        graph = IncludeGraph(path)
+        print(f"reopen:         {time.perf_counter() - start:8.2f} s ({len(graph)} domains)")
+        graph.close()
+
+
+if __name__ == '__main__':
+    main()
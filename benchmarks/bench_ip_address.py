@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Benchmark the ip4/ip6 address parsers against :mod:`ipaddress` on synthetic records."""
+
+import ipaddress
+import os
+import random
+import sys
+import time
+import typing
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# pylint: disable=wrong-import-position
+from module_name.spf.ip_address import (parse_ip4, parse_ip6)  # noqa: E402
+
+
+def records(count: int) -> typing.List[str]:
+    """Return `count` records with a few ip4/ip6 mechanisms each."""
+    rng = random.Random(5)
+    result = []
+    for _ in range(count):
+        terms = [f"ip4:{ipaddress.IPv4Address(rng.getrandbits(32))}/{rng.randrange(16, 33)}"
+                 for _ in range(rng.randrange(1, 8))]
+        terms += [f"ip6:{ipaddress.IPv6Address(rng.getrandbits(64) << 64)}/{rng.randrange(32, 65)}"
+                  for _ in range(rng.randrange(0, 4))]
+        terms += ["ip6:::ffff:" + str(ipaddress.IPv4Address(rng.getrandbits(32)))] \
+            * rng.randrange(2)
+        result.append("v=spf1 " + " ".join(terms) + " -all")
+    return result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    arguments = [term.split(":", 1) for record in records(count)
+                 for term in record.split()[1:-1]]
+    print(f"{len(arguments)} ip4/ip6 arguments from {count} records")
+
+    start = time.perf_counter()
+    for kind, argument in arguments:
+        address, _, _ = argument.partition("/")
+        assert (parse_ip4 if kind == "ip4" else parse_ip6)(address) is not None
+    print(f"ip_address:         {time.perf_counter() - start:8.2f} s")
+
+    start = time.perf_counter()
+    for _, argument in arguments:
+        ipaddress.ip_network(argument, strict=False)
+    print(f"ipaddress network:  {time.perf_counter() - start:8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
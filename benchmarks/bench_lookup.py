@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Benchmark "mx" evaluation with a high-latency resolver, sequential versus concurrent."""
+
+import asyncio
+import os
+import sys
+import time
+import typing
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# pylint: disable=wrong-import-position
+from module_name.spf import lookup  # noqa: E402
+from module_name.spf.limits import MX_LIMIT  # noqa: E402
+
+
+class SlowResolver():
+    """Answers every query after `latency` seconds; the last MX name has the address."""
+    def __init__(self, latency: float, names: int) -> None:
+        """Create a :class:`SlowResolver` with `names` MX names."""
+        self.latency = latency
+        self.names = [f"mx{i}.example.org" for i in range(names)]
+
+    async def query(self, name: str, rdtype: str) -> typing.Sequence[str]:
+        """Answer after the latency."""
+        await asyncio.sleep(self.latency)
+        if rdtype == "MX":
+            return self.names
+        return ["192.0.2.10" if name == self.names[-1] else "192.0.2.1"]
+
+
+async def evaluate(resolver: SlowResolver, max_concurrency: int) -> float:
+    """Return the seconds evaluating "mx" takes."""
+    start = time.perf_counter()
+    evaluation = lookup.Evaluation(resolver, max_concurrency)
+    assert await lookup.mx_match(evaluation, "example.org", 0xc000020a, 32)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+    resolver = SlowResolver(latency, MX_LIMIT)
+    print(f"{MX_LIMIT} MX names, {latency * 1e3:.0f} ms per query")
+    for max_concurrency in (1, 4, 10):
+        seconds = asyncio.run(evaluate(resolver, max_concurrency))
+        print(f"max_concurrency={max_concurrency:<3} {seconds * 1e3:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Benchmark batched DKIM signature verification, inline and on a process pool."""
+
+import concurrent.futures
+import os
+import sys
+import time
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# pylint: disable=wrong-import-position
+from module_name import dkim  # noqa: E402
+
+
+FIXTURES = os.path.join(ROOT, "tests", "fixtures", "dkim")
+
+
+def fixture(name: str) -> bytes:
+    """Return the contents of a fixture file."""
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    key = dkim.PublicKey.from_der(fixture("key2048.der"))
+    jobs = [dkim.Job('rsa-sha256', key, fixture("sha256-key2048.sig"), fixture("message"))] \
+        * count
+
+    start = time.perf_counter()
+    assert all(r is True for r in dkim.verify_batch(jobs))
+    inline = time.perf_counter() - start
+    print(f"inline:          {count / inline:10.0f} signatures/s")
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        start = time.perf_counter()
+        assert all(r is True for r in dkim.verify_batch(jobs, executor))
+        pooled = time.perf_counter() - start
+    print(f"{workers:>3} processes:   {count / pooled:10.0f} signatures/s")
+
+    value = fixture("key2048.der")
+    start = time.perf_counter()
+    for _ in range(count):
+        dkim.PublicKey.from_der(value)
+    print(f"key decoding:    {count / (time.perf_counter() - start):10.0f} keys/s")
+
+
+if __name__ == '__main__':
+    main()
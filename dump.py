@@ -6,6 +6,7 @@ import sys
 import typing
 from module_name import spf
 from module_name.spf import cidr_length
+from module_name.spf import instrumentation
 
 
 # test...
@@ -75,11 +76,21 @@ def spf_parse() -> None:
         print(f"{t.__class__.__name__:<12} for \"{t.string}\"")
 
 
+def spf_profile() -> None:
+    with open(input("Corpus file (one SPF string per line): "), encoding="utf-8") as corpus:
+        policies = [line.rstrip("\n") for line in corpus if line.strip()]
+    with instrumentation.collect() as collector:
+        for policy in policies:
+            spf.Parser.parse(policy)
+    print(collector.table())
+
+
 def main() -> None:
-    parser = input("Parser? (cidr, spf) ")
+    parser = input("Parser? (cidr, spf, profile) ")
     function = {
         'cidr': cidr_parse,
         'spf': spf_parse,
+        'profile': spf_profile,
     }[parser]
     function()
 
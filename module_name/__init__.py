@@ -2,4 +2,28 @@
 # flake8: noqa: F401
 """TODO"""
 
-from . import spf
+import importlib
+import typing
+if typing.TYPE_CHECKING:
+    # pylint: disable=unused-import
+    from . import dkim
+    from . import spf
+
+
+# subpackages are imported on first access to keep the import of module_name cheap
+SUBPACKAGES = frozenset(('dkim', 'spf'))
+
+__all__ = ['dkim', 'spf']
+
+
+def __getattr__(name: str) -> typing.Any:
+    """Import the subpackage `name` on first access."""
+    if name not in SUBPACKAGES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = importlib.import_module(f".{name}", __name__)
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    """List the module's attributes, including the subpackages not imported yet."""
+    return sorted(set(globals()) | SUBPACKAGES)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# flake8: noqa: F401
+"""DKIM."""
+
+import importlib
+import typing
+if typing.TYPE_CHECKING:
+    # pylint: disable=unused-import
+    from .canonicalization import (
+        BodyCanonicalizer,
+        RelaxedBodyCanonicalizer,
+        SimpleBodyCanonicalizer,
+        async_body_hash,
+        body_hash,
+    )
+    from .error import (
+        AlgorithmError,
+        InvalidKeyError,
+        KeySizeError,
+        VerificationError,
+    )
+    from .key import (KeyCache, PublicKey)
+    from .verification import (Job, verify, verify_batch)
+
+
+# the submodule defining each exported name;
+# they are imported on first access, so that e.g. body hashing does not pull in verification
+EXPORTS = {
+    'BodyCanonicalizer': 'canonicalization',
+    'RelaxedBodyCanonicalizer': 'canonicalization',
+    'SimpleBodyCanonicalizer': 'canonicalization',
+    'async_body_hash': 'canonicalization',
+    'body_hash': 'canonicalization',
+    'AlgorithmError': 'error',
+    'InvalidKeyError': 'error',
+    'KeySizeError': 'error',
+    'VerificationError': 'error',
+    'KeyCache': 'key',
+    'PublicKey': 'key',
+    'Job': 'verification',
+    'verify': 'verification',
+    'verify_batch': 'verification',
+}
+
+# spelled out for type checkers, which do not evaluate sorted(EXPORTS)
+__all__ = [
+    'AlgorithmError',
+    'BodyCanonicalizer',
+    'InvalidKeyError',
+    'Job',
+    'KeyCache',
+    'KeySizeError',
+    'PublicKey',
+    'RelaxedBodyCanonicalizer',
+    'SimpleBodyCanonicalizer',
+    'VerificationError',
+    'async_body_hash',
+    'body_hash',
+    'verify',
+    'verify_batch',
+]
+
+
+def __getattr__(name: str) -> typing.Any:
+    """Import the submodule defining `name` on first access."""
+    module = EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(f".{module}", __name__), name)
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    """List the module's attributes, including the exports not imported yet."""
+    return sorted(set(globals()) | set(EXPORTS))
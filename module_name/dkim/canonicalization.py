@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""DKIM body canonicalization (RFC 6376, section 3.4)."""
+
+import abc
+import hashlib
+import typing
+from module_name.lazy_pattern import LazyPattern
+
+
+Chunk = typing.Union[bytes, bytearray, memoryview]
+
+
+class AsyncReader(typing.Protocol):
+    """Anything with an awaitable `read`, e.g. :class:`asyncio.StreamReader`."""
+    async def read(self, n: int = -1) -> bytes:
+        """Read up to `n` bytes; return `b""` at EOF."""
+        ...
+
+
+class BodyCanonicalizer(abc.ABC):
+    """Abstract streaming body canonicalizer.
+
+    The body is fed in arbitrarily split chunks via :meth:`update`.
+    The canonicalized body is passed on to `hasher` as it is produced,
+    so memory use does not depend on the size of the body.
+
+    Only trailing CRLFs and (for "relaxed") a single pending whitespace character
+    are held back between chunks, since whether they are emitted depends on what follows.
+    """
+    # number of CRLFs written at once when flushing held back empty lines
+    CRLF_BLOCK: typing.ClassVar[int] = 4096
+
+    def __init__(self, hasher: 'hashlib._Hash', limit: typing.Optional[int] = None) -> None:
+        """Create a :class:`BodyCanonicalizer`.
+
+        `hasher` is a `hashlib` object that is updated with the canonicalized body.
+        `limit` is the value of the "l=" tag, i.e. the maximum number of octets to hash.
+        """
+        assert limit is None or limit >= 0
+        self.hasher = hasher
+        self.limit = limit
+        self.length = 0
+        self._carry = b""
+        self._pending_crlfs = 0
+        self._emitted = False
+        self._finished = False
+
+    def update(self, chunk: Chunk) -> None:
+        """Canonicalize and hash the next chunk of the body."""
+        assert not self._finished
+        data, self._carry = self._transform(self._carry + chunk)
+        self._push(data)
+
+    def finish(self) -> None:
+        """Flush held back data after the last chunk.
+
+        This is idempotent.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        self._push(self._final_carry(self._carry))
+        self._carry = b""
+        if self._emitted or self._empty_body_is_crlf():
+            self._write(b"\r\n")
+
+    def digest(self) -> bytes:
+        """Finish canonicalization and return the body hash."""
+        self.finish()
+        return self.hasher.digest()
+
+    @abc.abstractmethod
+    def _transform(self, data: bytes) -> typing.Tuple[bytes, bytes]:
+        """Canonicalize `data`.
+
+        Returns a tuple (
+
+            * canonicalized data, which may end in CRLFs
+            * carry, which is prepended to the next chunk
+
+        ).
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _final_carry(self, carry: bytes) -> bytes:
+        """Return the part of `carry` that is body content once no more data follows."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _empty_body_is_crlf(self) -> bool:
+        """Whether an empty body is canonicalized as a single CRLF."""
+        raise NotImplementedError()
+
+    def _push(self, data: bytes) -> None:
+        """Hash canonicalized `data`, holding back trailing CRLFs."""
+        end = len(data)
+        while data.endswith(b"\r\n", 0, end):
+            end -= 2
+        if end:
+            self._flush_crlfs()
+            self._write(data[:end] if end != len(data) else data)
+            self._emitted = True
+        self._pending_crlfs += (len(data) - end) // 2
+
+    def _flush_crlfs(self) -> None:
+        """Hash CRLFs that turned out not to be at the end of the body."""
+        while self._pending_crlfs:
+            count = min(self._pending_crlfs, self.CRLF_BLOCK)
+            self._write(b"\r\n" * count)
+            self._pending_crlfs -= count
+
+    def _write(self, data: bytes) -> None:
+        """Hash `data`, honouring :attr:`limit`."""
+        if self.limit is not None:
+            remaining = self.limit - self.length
+            if remaining <= 0:
+                return
+            if len(data) > remaining:
+                data = data[:remaining]
+        self.length += len(data)
+        self.hasher.update(data)
+
+
+class SimpleBodyCanonicalizer(BodyCanonicalizer):
+    """The "simple" body canonicalization algorithm (RFC 6376, section 3.4.3)."""
+
+    def _transform(self, data: bytes) -> typing.Tuple[bytes, bytes]:
+        # a trailing CR may be the start of a CRLF
+        if data.endswith(b"\r"):
+            return data[:-1], b"\r"
+        return data, b""
+
+    def _final_carry(self, carry: bytes) -> bytes:
+        return carry
+
+    def _empty_body_is_crlf(self) -> bool:
+        return True
+
+
+class RelaxedBodyCanonicalizer(BodyCanonicalizer):
+    """The "relaxed" body canonicalization algorithm (RFC 6376, section 3.4.4)."""
+    TRAILING_WSP_RE = LazyPattern(rb"[ \t]+\r\n")
+    WSP_RE = LazyPattern(rb"[ \t]+")
+
+    def _transform(self, data: bytes) -> typing.Tuple[bytes, bytes]:
+        carry = b""
+        if data.endswith(b"\r"):
+            data = data[:-1]
+            carry = b"\r"
+        stripped = data.rstrip(b" \t")
+        if len(stripped) != len(data):
+            # whitespace runs are reduced to a single SP anyway,
+            # so there is no need to carry more than that
+            carry = b" " + carry
+        data = self.TRAILING_WSP_RE.sub(b"\r\n", stripped)
+        return self.WSP_RE.sub(b" ", data), carry
+
+    def _final_carry(self, carry: bytes) -> bytes:
+        # a lone CR is content, whitespace without anything following is not
+        return carry if carry.endswith(b"\r") else b""
+
+    def _empty_body_is_crlf(self) -> bool:
+        return False
+
+
+CANONICALIZERS: typing.Dict[str, typing.Type[BodyCanonicalizer]] = {
+    'simple': SimpleBodyCanonicalizer,
+    'relaxed': RelaxedBodyCanonicalizer,
+}
+
+
+def body_hash(chunks: typing.Iterable[Chunk], canonicalization: str, hash_name: str,
+              limit: typing.Optional[int] = None) -> bytes:
+    """Compute the body hash ("bh=") of a body.
+
+    `chunks` is the body, split arbitrarily.
+    `canonicalization` is the body canonicalization algorithm ("simple" or "relaxed").
+    `hash_name` is the name of the hash algorithm as known to `hashlib` (e.g. "sha256").
+    `limit` is the value of the "l=" tag.
+
+    Raises a :exc:`KeyError` for an unknown `canonicalization`.
+    """
+    canonicalizer = CANONICALIZERS[canonicalization](hashlib.new(hash_name), limit)
+    for chunk in chunks:
+        canonicalizer.update(chunk)
+    return canonicalizer.digest()
+
+
+async def async_body_hash(reader: AsyncReader, canonicalization: str, hash_name: str,
+                          limit: typing.Optional[int] = None,
+                          chunk_size: int = 64 * 1024) -> bytes:
+    """Compute the body hash ("bh=") of a body read from `reader` until EOF.
+
+    `chunk_size` is the maximum number of bytes read at once.
+    The remaining arguments are the same as for :func:`body_hash`.
+    """
+    canonicalizer = CANONICALIZERS[canonicalization](hashlib.new(hash_name), limit)
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            break
+        canonicalizer.update(chunk)
+    return canonicalizer.digest()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""DKIM verification errors."""
+
+import typing
+
+
+class VerificationError(RuntimeError):
+    """Errors while verifying DKIM signatures.
+
+    These are permanent failures in the sense of RFC 6376, section 3.9.
+    """
+    pass
+
+
+class InvalidKeyError(VerificationError):
+    """A malformed public key."""
+    pass
+
+
+class AlgorithmError(VerificationError):
+    """An unknown or historic signing algorithm (RFC 8301, section 3.1)."""
+    def __init__(self, algorithm: str) -> None:
+        """Create a :class:`AlgorithmError`.
+
+        `algorithm` is the value of the "a=" tag.
+        """
+        super().__init__(algorithm)
+        self.algorithm = algorithm
+
+
+class KeySizeError(VerificationError):
+    """A key that is too short (RFC 8301, section 3.2) or too long to verify with."""
+    def __init__(self, bits: int, valid_range: typing.Tuple[int, int]) -> None:
+        """Create a :class:`KeySizeError`.
+
+        `bits` is the size of the key's modulus.
+        `valid_range` specifies the allowed sizes.
+        """
+        assert bits < valid_range[0] or bits > valid_range[1]
+        super().__init__(bits, valid_range)
+        self.bits = bits
+        self.valid_range = valid_range
+
+    @property
+    def valid_range_str(self) -> str:
+        """A `str`ified :attr:`valid_range`."""
+        return f"[{self.valid_range[0]}..{self.valid_range[1]}]"
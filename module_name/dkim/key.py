@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""DKIM public keys."""
+
+import base64
+import binascii
+import collections
+import threading
+import time
+import typing
+from .error import InvalidKeyError
+
+
+# OID 1.2.840.113549.1.1.1, DER-encoded
+RSA_ENCRYPTION_OID = bytes.fromhex("2a864886f70d010101")
+
+# keys are published by arbitrary domains, so bound the cost of pow() during verification
+MAX_MODULUS_BITS = 8192
+MAX_EXPONENT_BITS = 64
+
+
+def _der_read(data: bytes, offset: int, tag: int) -> typing.Tuple[bytes, int]:
+    """Read a DER TLV.
+
+    `data` is the DER-encoded data.
+    `offset` is where the TLV starts.
+    `tag` is the expected tag.
+
+    Returns a tuple (
+
+        * the value
+        * the offset after the TLV
+
+    ).
+
+    Raises a :exc:`InvalidKeyError` when the TLV is malformed or has a different tag.
+    """
+    if offset + 2 > len(data) or data[offset] != tag:
+        raise InvalidKeyError(f"Expected DER tag {tag:#04x} at offset {offset}.")
+    length = data[offset + 1]
+    offset += 2
+    if length & 0x80:
+        size = length & 0x7f
+        if size == 0 or size > 4 or offset + size > len(data):
+            raise InvalidKeyError(f"Invalid DER length at offset {offset - 1}.")
+        length = int.from_bytes(data[offset:offset + size], 'big')
+        offset += size
+    end = offset + length
+    if end > len(data):
+        raise InvalidKeyError(f"DER value at offset {offset} exceeds the data.")
+    return data[offset:end], end
+
+
+class PublicKey():
+    """An RSA public key."""
+    def __init__(self, modulus: int, exponent: int) -> None:
+        """Create a :class:`PublicKey`."""
+        self.modulus = modulus
+        self.exponent = exponent
+
+    @property
+    def bits(self) -> int:
+        """The size of the modulus in bits."""
+        return self.modulus.bit_length()
+
+    @classmethod
+    def from_der(cls, der: bytes) -> 'PublicKey':
+        """Decode a key.
+
+        `der` is either a SubjectPublicKeyInfo (as RFC 6376 mandates for "p=")
+        or a bare RSAPublicKey (as some publishers use instead).
+
+        Raises a :exc:`InvalidKeyError` when decoding fails
+        or the modulus or exponent exceed :data:`MAX_MODULUS_BITS` or :data:`MAX_EXPONENT_BITS`.
+        """
+        sequence, end = _der_read(der, 0, 0x30)
+        if end != len(der):
+            raise InvalidKeyError("Junk after DER sequence.")
+        if sequence[:1] == b"\x30":
+            # SubjectPublicKeyInfo
+            algorithm, offset = _der_read(sequence, 0, 0x30)
+            oid, _ = _der_read(algorithm, 0, 0x06)
+            if oid != RSA_ENCRYPTION_OID:
+                raise InvalidKeyError("Not an RSA key.")
+            bit_string, _ = _der_read(sequence, offset, 0x03)
+            if bit_string[:1] != b"\x00":
+                raise InvalidKeyError("Public key BIT STRING has unused bits.")
+            sequence, end = _der_read(bit_string, 1, 0x30)
+            if end != len(bit_string):
+                raise InvalidKeyError("Junk after RSAPublicKey.")
+        modulus_bytes, offset = _der_read(sequence, 0, 0x02)
+        exponent_bytes, _ = _der_read(sequence, offset, 0x02)
+        key = cls(int.from_bytes(modulus_bytes, 'big'), int.from_bytes(exponent_bytes, 'big'))
+        if key.bits > MAX_MODULUS_BITS:
+            raise InvalidKeyError(f"Modulus exceeds {MAX_MODULUS_BITS} bits.")
+        if key.exponent.bit_length() > MAX_EXPONENT_BITS:
+            raise InvalidKeyError(f"Exponent exceeds {MAX_EXPONENT_BITS} bits.")
+        return key
+
+    @classmethod
+    def from_base64(cls, value: str) -> 'PublicKey':
+        """Decode the "p=" tag of a key record.
+
+        Raises a :exc:`InvalidKeyError` when decoding fails.
+        An empty `value` (i.e. a revoked key) is invalid as well.
+        """
+        # FWS is allowed within base64string
+        value = "".join(value.split())
+        if not value:
+            raise InvalidKeyError("Key has been revoked.")
+        try:
+            der = base64.b64decode(value, validate=True)
+        except binascii.Error as e:
+            raise InvalidKeyError("Invalid base64.") from e
+        return cls.from_der(der)
+
+
+class KeyCache():
+    """Cache of decoded :class:`PublicKey`s by (selector, domain).
+
+    Entries expire after the TTL of the DNS record they were decoded from.
+    When the cache is full, the least recently used entry is evicted.
+    """
+    def __init__(self, max_entries: int = 10000,
+                 clock: typing.Callable[[], float] = time.monotonic) -> None:
+        """Create a :class:`KeyCache`.
+
+        `max_entries` is the maximum number of keys kept.
+        `clock` returns the current time in seconds.
+        """
+        assert max_entries > 0
+        self.max_entries = max_entries
+        self.clock = clock
+        # (expiry, key) by (selector, domain), least recently used first
+        self._keys: typing.OrderedDict[typing.Tuple[str, str], typing.Tuple[float, PublicKey]] = \
+            collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached keys, including expired ones."""
+        return len(self._keys)
+
+    def get(self, selector: str, domain: str,
+            fetch: typing.Callable[[str, str], typing.Tuple[str, float]]) -> PublicKey:
+        """Return the key for `selector` and `domain`.
+
+        `fetch` is called with `selector` and `domain` on a miss and returns a tuple (
+
+            * the "p=" tag of the key record
+            * the TTL of the record
+
+        ).
+
+        Raises a :exc:`InvalidKeyError` when the key cannot be decoded.
+        Invalid keys are not cached.
+        """
+        # domain names are case-insensitive
+        cache_key = (selector.lower(), domain.lower())
+        now = self.clock()
+        with self._lock:
+            entry = self._keys.get(cache_key)
+            if entry is not None:
+                expiry, key = entry
+                if expiry > now:
+                    self._keys.move_to_end(cache_key)
+                    return key
+                del self._keys[cache_key]
+        value, ttl = fetch(selector, domain)
+        key = PublicKey.from_base64(value)
+        with self._lock:
+            self._keys[cache_key] = (now + ttl, key)
+            self._keys.move_to_end(cache_key)
+            # expired entries at the front go first, then the least recently used ones
+            while self._keys:
+                oldest = next(iter(self._keys.values()))
+                if len(self._keys) <= self.max_entries and oldest[0] > now:
+                    break
+                self._keys.popitem(last=False)
+        return key
+
+    def purge(self) -> None:
+        """Remove expired entries."""
+        now = self.clock()
+        with self._lock:
+            self._keys = collections.OrderedDict(
+                (k, v) for k, v in self._keys.items() if v[0] > now)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""DKIM signature verification (RFC 6376 as updated by RFC 8301)."""
+
+import hashlib
+import typing
+if typing.TYPE_CHECKING:
+    # importing concurrent.futures is comparatively slow and only needed for the annotation
+    # pylint: disable=unused-import
+    import concurrent.futures  # noqa: F401
+from .error import (AlgorithmError, InvalidKeyError, KeySizeError, VerificationError)
+from .key import (MAX_EXPONENT_BITS, MAX_MODULUS_BITS, PublicKey)
+
+
+# RFC 8301, section 3.2
+MIN_KEY_BITS = 1024
+
+# DER-encoded DigestInfo prefixes for EMSA-PKCS1-v1_5 (RFC 8017, section 9.2)
+DIGEST_INFO_PREFIXES: typing.Dict[str, bytes] = {
+    'sha256': bytes.fromhex("3031300d060960864801650304020105000420"),
+}
+
+# "a=" tag values RFC 8301 permits, mapped to the hash algorithm
+ALGORITHMS: typing.Dict[str, str] = {
+    'rsa-sha256': 'sha256',
+}
+
+
+class Job(typing.NamedTuple):
+    """A single signature to verify."""
+    algorithm: str
+    key: PublicKey
+    signature: bytes
+    data: bytes
+
+
+def hash_algorithm(algorithm: str) -> str:
+    """Return the hash algorithm for the "a=" tag `algorithm`.
+
+    Raises a :exc:`AlgorithmError` for rsa-sha1 and unknown algorithms.
+    """
+    try:
+        return ALGORITHMS[algorithm.lower()]
+    except KeyError:
+        raise AlgorithmError(algorithm) from None
+
+
+def check_key(key: PublicKey) -> None:
+    """Check that `key` may be used.
+
+    Raises a :exc:`KeySizeError` if `key` is too short or too long,
+    and a :exc:`InvalidKeyError` if its exponent is too large.
+    """
+    if not MIN_KEY_BITS <= key.bits <= MAX_MODULUS_BITS:
+        raise KeySizeError(key.bits, (MIN_KEY_BITS, MAX_MODULUS_BITS))
+    if key.exponent.bit_length() > MAX_EXPONENT_BITS:
+        raise InvalidKeyError(f"Exponent exceeds {MAX_EXPONENT_BITS} bits.")
+
+
+def verify(algorithm: str, key: PublicKey, signature: bytes, data: bytes) -> bool:
+    """Verify a signature.
+
+    `algorithm` is the value of the "a=" tag.
+    `key` is the signer's key.
+    `signature` is the decoded "b=" tag.
+    `data` is the canonicalized header data that was signed.
+
+    Returns whether the signature matches.
+
+    Raises a :exc:`VerificationError` if RFC 8301 forbids considering the signature valid.
+    """
+    hash_name = hash_algorithm(algorithm)
+    check_key(key)
+    digest = hashlib.new(hash_name, data).digest()
+
+    length = (key.bits + 7) // 8
+    if len(signature) != length:
+        return False
+    value = int.from_bytes(signature, 'big')
+    if value >= key.modulus:
+        return False
+    encoded = pow(value, key.exponent, key.modulus).to_bytes(length, 'big')
+
+    digest_info = DIGEST_INFO_PREFIXES[hash_name] + digest
+    padding = length - len(digest_info) - 3
+    if padding < 8:
+        return False
+    return encoded == b"\x00\x01" + b"\xff" * padding + b"\x00" + digest_info
+
+
+def _verify_job(job: Job) -> typing.Union[bool, VerificationError]:
+    """Verify `job`, returning errors instead of raising them."""
+    try:
+        return verify(*job)
+    except VerificationError as e:
+        return e
+
+
+def verify_batch(jobs: typing.Iterable[Job],
+                 executor: typing.Optional['concurrent.futures.Executor'] = None,
+                 chunksize: int = 64) -> typing.List[typing.Union[bool, VerificationError]]:
+    """Verify many signatures.
+
+    `jobs` are the signatures to verify.
+    `executor` runs the verifications, e.g. a :class:`concurrent.futures.ProcessPoolExecutor`
+    to get the modular exponentiation out from under the GIL.
+    Without an `executor` the batch is verified in the calling thread.
+    `chunksize` is the number of jobs sent to a worker process at once
+    (it is ignored by thread pools).
+
+    Returns, in order of `jobs`, whether each signature matches
+    or the :exc:`VerificationError` :func:`verify` raised for it.
+    """
+    if executor is None:
+        return list(map(_verify_job, jobs))
+    return list(executor.map(_verify_job, jobs, chunksize=chunksize))
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Defines :class:`LazyPattern`."""
+
+import re
+import typing
+
+
+class LazyPattern(typing.Generic[typing.AnyStr]):
+    """A regular expression that is compiled on first use.
+
+    This keeps compiling patterns out of the import.
+    As a class attribute, accessing it yields the compiled pattern;
+    elsewhere, use :attr:`compiled`.
+    """
+    def __init__(self, pattern: typing.AnyStr) -> None:
+        """Create a :class:`LazyPattern` for `pattern` (a `str` or `bytes`)."""
+        self.pattern: typing.AnyStr = pattern
+        self._compiled: typing.Optional[typing.Pattern[typing.AnyStr]] = None
+
+    @property
+    def compiled(self) -> typing.Pattern[typing.AnyStr]:
+        """The compiled pattern."""
+        # compiling twice from different threads is harmless
+        if self._compiled is None:
+            self._compiled = re.compile(self.pattern)
+        return self._compiled
+
+    def __get__(self, instance: object, owner: type) -> typing.Pattern[typing.AnyStr]:
+        """Return the compiled pattern."""
+        return self.compiled
@@ -3,6 +3,7 @@
 
 # import re
 import typing
+from module_name.spf import instrumentation
 from module_name.spf.error import ParsingError
 from module_name.parsing_string import ParsingString
 from .cidr_lengths import CidrLengths
@@ -18,7 +19,12 @@ from .error import (
 
 
 class Parser():
-    """Parser of a cidr-length string."""
+    """Parser of a cidr-length string.
+
+    A :class:`Parser` is immutable, so the shared instances can be used from any thread.
+    """
+    __slots__ = ('_ip4', '_ip6')
+
     # IP4_CIDR_RE: typing.ClassVar[typing.Pattern] = re.compile(r"/(0|[1-9]\d?)")
     # IP6_CIDR_RE: typing.ClassVar[typing.Pattern] = re.compile(r"/(0|[1-9]\d{0-2})")
 
@@ -28,8 +34,25 @@ class Parser():
         `ip4` and `ip6` specify which kinds of CIDR-lengths this :class:`Parser` parses.
         """
         assert ip4 or ip6
-        self.ip4 = ip4
-        self.ip6 = ip6
+        self._ip4 = ip4
+        self._ip6 = ip6
+
+    @property
+    def ip4(self) -> bool:
+        """Whether this parses an ip4-cidr-length."""
+        return self._ip4
+
+    @property
+    def ip6(self) -> bool:
+        """Whether this parses an ip6-cidr-length."""
+        return self._ip6
+
+    @property
+    def kind(self) -> str:
+        """The type of cidr-length string this parses (e.g. "dual-cidr-length")."""
+        if self._ip4 and self._ip6:
+            return "dual-cidr-length"
+        return "ip4-cidr-length" if self._ip4 else "ip6-cidr-length"
 
     def parse(self, length: str) -> CidrLengths:
         """Parse a cidr-length.
@@ -38,6 +61,19 @@ class Parser():
 
         Returns a :class:`CidrLengths`.
         """
+        collector = instrumentation.active()
+        if collector is None:
+            return self._parse_lengths(length)
+
+        outermost = collector.depth == 0
+        with collector.phase("cidr-length"):
+            cidr = self._parse_lengths(length)
+        if outermost:
+            collector.count_cidr_lengths(self.kind, cidr)
+        return cidr
+
+    def _parse_lengths(self, length: str) -> CidrLengths:
+        """Same as :meth:`parse`, but without instrumentation."""
         view = ParsingString(length)
         cidr = CidrLengths(length)
 
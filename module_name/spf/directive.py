@@ -2,24 +2,45 @@
 """Defines :class:`Directive`."""
 
 
-import collections
-import re
+import abc
+import types
 import typing
-from .error import UnknownDirectiveError
+from module_name.lazy_pattern import LazyPattern
+from . import ip_address
+from .cidr_length.cidr_lengths import CidrLengths
+from .cidr_length.parser import (
+    DUAL_PARSER as DualCidrLengthParser,
+    IP4_PARSER as IP4CidrLengthParser,
+    IP6_PARSER as IP6CidrLengthParser,
+)
+from .error import (
+    InvalidArgumentError,
+    InvalidNetworkError,
+    MissingArgumentError,
+    UnknownDirectiveError,
+)
 from .term import Term
 
 
 # FIXME: quite similar to Modifier; unify?
 class Directive(Term):
-    """Abstract directive."""
-    DIRECTIVE_RE: typing.ClassVar[typing.Pattern[str]] = \
-        re.compile(fr"({Term.NAME_PATTERN})(?::(.*))?")
+    """Abstract directive.
 
-    HANDLERS: typing.ClassVar[typing.DefaultDict[str, typing.Type['Directive']]]
+    :attr:`qualifier` is one of "+", "-", "~" and "?", defaulting to "+" (RFC 7208, section 4.6.2).
+    :attr:`arg` is the part after ":", if any.
+    """
+    # [ qualifier ] name [ ":" arg | cidr-length ], the latter only being valid for "a" and "mx"
+    DIRECTIVE_RE = LazyPattern(fr"([-+~?])?({Term.NAME_PATTERN})(?::(.*)|(/.*))?")
+
+    # read-only, so that it can be shared between threads
+    HANDLERS: typing.ClassVar[typing.Mapping[str, typing.Type['Directive']]]
 
     def __init__(self, match: typing.Match[str]) -> None:
         super().__init__(match.group(0))
-        self.arg = match.group(2)
+        self.qualifier = match.group(1) or "+"
+        self.arg = match.group(3)
+        if match.group(4) is not None:
+            self._parse_cidr_lengths(match.group(4))
 
     @classmethod
     def parse(cls, term: str) -> typing.Optional['Directive']:
@@ -27,8 +48,15 @@ class Directive(Term):
         if not match:
             return None
 
-        name = match.group(1)
-        return cls.HANDLERS[name](match)
+        name = match.group(2)
+        return cls.HANDLERS.get(name, Unknown)(match)
+
+    def _parse_cidr_lengths(self, string: str) -> None:
+        """Parse a dual-cidr-length directly following the name (e.g. "mx/24").
+
+        Only "a" and "mx" take one.
+        """
+        self._errors.append(InvalidArgumentError(self))
 
 
 class All(Directive):
@@ -36,39 +64,156 @@ class All(Directive):
     pass
 
 
-class Include(Directive):
+class DomainDirective(Directive):
+    """Abstract directive with a domain-spec argument.
+
+    :attr:`domain_spec` is `None` if the argument is absent (or invalid),
+    in which case the current domain is used.
+    """
+    DNS_LOOKUPS: typing.ClassVar[int] = 1
+    ARG_MANDATORY: typing.ClassVar[bool] = False
+    DUAL_CIDR: typing.ClassVar[bool] = False
+
+    domain_spec: typing.Optional[str] = None
+    cidr_lengths: typing.Optional[CidrLengths] = None
+
+    def __init__(self, match: typing.Match[str]) -> None:
+        super().__init__(match)
+        if self.arg is None:
+            if self.ARG_MANDATORY:
+                self._errors.append(MissingArgumentError(self))
+            return
+
+        domain_spec = self.arg
+        if self.DUAL_CIDR:
+            # note: macro-literals may contain "/" too, but those are unlikely in practice
+            domain_spec, separator, _ = self.arg.partition("/")
+            if separator:
+                self._parse_cidr_lengths(self.arg[len(domain_spec):])
+        if not domain_spec:
+            self._errors.append(MissingArgumentError(self))
+            return
+        self.domain_spec = domain_spec
+
+    def _parse_cidr_lengths(self, string: str) -> None:
+        if not self.DUAL_CIDR:
+            super()._parse_cidr_lengths(string)
+            return
+        self.cidr_lengths = DualCidrLengthParser.parse(string)
+        self._errors.extend(self.cidr_lengths.errors)
+
+    @property
+    def has_macros(self) -> bool:
+        """Whether :attr:`domain_spec` needs macro expansion."""
+        return self.domain_spec is not None and "%" in self.domain_spec
+
+
+class Include(DomainDirective):
     """"include" directive."""
-    pass
+    ARG_MANDATORY: typing.ClassVar[bool] = True
 
 
-class Address(Directive):
+class Address(DomainDirective):
     """"a" directive."""
-    pass
+    DUAL_CIDR: typing.ClassVar[bool] = True
 
 
-class MailExchange(Directive):
+class MailExchange(DomainDirective):
     """"mx" directive."""
-    pass
+    DUAL_CIDR: typing.ClassVar[bool] = True
 
 
-class Pointer(Directive):
+class Pointer(DomainDirective):
     """"ptr" directive."""
     pass
 
 
-class IP4Address(Directive):
+class IPNetwork(Directive, abc.ABC):
+    """Abstract "ip4"/"ip6" directive.
+
+    The argument is parsed into the `int`s :attr:`network` (with the host bits cleared)
+    and :attr:`prefix_length`. Both are `None` if the argument could not be parsed.
+    """
+    BITS: typing.ClassVar[int]
+    NETWORK_KIND: typing.ClassVar[str]
+
+    network: typing.Optional[int] = None
+    prefix_length: typing.Optional[int] = None
+
+    def __init__(self, match: typing.Match[str]) -> None:
+        super().__init__(match)
+        if self.arg is None:
+            self._errors.append(MissingArgumentError(self))
+            return
+
+        address_str, separator, _ = self.arg.partition("/")
+        address = self._parse_address(address_str)
+        if address is None:
+            self._errors.append(InvalidNetworkError(self, self.NETWORK_KIND))
+        prefix_length: typing.Optional[int] = self.BITS
+        if separator:
+            prefix_length = self._parse_cidr_length(self.arg[len(address_str):])
+        if address is None or prefix_length is None:
+            return
+
+        host_bits = self.BITS - prefix_length
+        self.network = address >> host_bits << host_bits
+        self.prefix_length = prefix_length
+
+    @abc.abstractmethod
+    def _parse_address(self, string: str) -> typing.Optional[int]:
+        """Parse the network part of the argument into an `int`."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _parse_cidr_length(self, string: str) -> typing.Optional[int]:
+        """Parse the cidr-length part of the argument.
+
+        Errors are appended to this directive's errors.
+        """
+        raise NotImplementedError()
+
+    def match(self, address: int) -> bool:
+        """Check if `address` is in :attr:`network`.
+
+        Must not be called if :attr:`network` is `None`.
+        """
+        assert self.network is not None and self.prefix_length is not None
+        return address >> (self.BITS - self.prefix_length) \
+            == self.network >> (self.BITS - self.prefix_length)
+
+
+class IP4Address(IPNetwork):
     """"ip4" directive."""
-    pass
+    BITS: typing.ClassVar[int] = 32
+    NETWORK_KIND: typing.ClassVar[str] = "ip4-network"
+
+    def _parse_address(self, string: str) -> typing.Optional[int]:
+        return ip_address.parse_ip4(string)
 
+    def _parse_cidr_length(self, string: str) -> typing.Optional[int]:
+        cidr = IP4CidrLengthParser.parse(string)
+        self._errors.extend(cidr.errors)
+        return cidr.ip4
 
-class IP6Address(Directive):
+
+class IP6Address(IPNetwork):
     """"ip6" directive."""
-    pass
+    BITS: typing.ClassVar[int] = 128
+    NETWORK_KIND: typing.ClassVar[str] = "ip6-network"
+
+    def _parse_address(self, string: str) -> typing.Optional[int]:
+        return ip_address.parse_ip6(string)
 
+    def _parse_cidr_length(self, string: str) -> typing.Optional[int]:
+        cidr = IP6CidrLengthParser.parse(string)
+        self._errors.extend(cidr.errors)
+        return cidr.ip6
 
-class Exists(Directive):
+
+class Exists(DomainDirective):
     """"exists" directive."""
-    pass
+    ARG_MANDATORY: typing.ClassVar[bool] = True
 
 
 class Unknown(Directive):
@@ -77,22 +222,18 @@ class Unknown(Directive):
         super().__init__(match)
         self._errors.append(UnknownDirectiveError(self))
 
-
-Directive.HANDLERS = collections.defaultdict(lambda: Unknown,
-                                             all=All,
-                                             include=Include,
-                                             a=Address,
-                                             mx=MailExchange,
-                                             ptr=Pointer,
-                                             ip4=IP4Address,
-                                             ip6=IP6Address,
-                                             exists=Exists,
-                                            )
-
-
-if __debug__:
-    def mod_name_checker() -> None:
-        mod_name = re.compile(Term.NAME_PATTERN)
-        for directive in Directive.HANDLERS.keys():
-            assert mod_name.fullmatch(directive), f"{directive} must match {mod_name.pattern}"
-    mod_name_checker()
+    def _parse_cidr_lengths(self, string: str) -> None:
+        # reported as an unknown directive already
+        pass
+
+
+Directive.HANDLERS = types.MappingProxyType({
+    'all': All,
+    'include': Include,
+    'a': Address,
+    'mx': MailExchange,
+    'ptr': Pointer,
+    'ip4': IP4Address,
+    'ip6': IP6Address,
+    'exists': Exists,
+})
@@ -45,3 +45,24 @@ class UnknownModifierError(UnknownTermError):
     """An unknown modifier was encountered."""
     def __init__(self, modifier: 'Modifier') -> None:
         super().__init__(modifier)
+
+
+class InvalidArgumentError(TermError):
+    """A term has an invalid argument."""
+    pass
+
+
+class MissingArgumentError(InvalidArgumentError):
+    """A term is missing its mandatory argument."""
+    pass
+
+
+class InvalidNetworkError(InvalidArgumentError):
+    """An invalid IP address in an "ip4" or "ip6" directive."""
+    def __init__(self, directive: 'Directive', kind: str) -> None:
+        """Create a :class:`InvalidNetworkError`.
+
+        `kind` specifies the type of network string (e.g. "ip4-network").
+        """
+        super().__init__(directive)
+        self.kind = kind
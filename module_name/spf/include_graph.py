@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Defines :class:`IncludeGraph`."""
+
+import collections
+import sqlite3
+import threading
+import typing
+from .directive import (Include, IPNetwork)
+from .limits import LOOKUP_LIMIT
+from .modifier import Redirect
+from .parser import Parser
+
+
+# (address bits, network, prefix length), e.g. (32, 0xc0000200, 24) for 192.0.2.0/24
+Network = typing.Tuple[int, int, int]
+
+
+class Summary(typing.NamedTuple):
+    """Transitive data of a domain's record.
+
+    Records that reach an include/redirect loop (and would thus fail evaluation)
+    all have the same summary, with :attr:`lookups` exceeding the limit and no :attr:`networks`.
+    """
+    # DNS lookups counted against limits.LOOKUP_LIMIT, including those of included records
+    lookups: int
+    # the valid "+" ip4/ip6 networks of the record, of the records it includes with "+",
+    # and of the record it redirects to
+    networks: typing.FrozenSet[Network]
+
+
+# the summary of records reaching a loop; compared by identity
+_LOOP = Summary(LOOKUP_LIMIT + 1, frozenset())
+
+
+class _Record(typing.NamedTuple):
+    """The parts of a parsed record the graph needs."""
+    lookups: int
+    # (domain, whether its networks pass) for each include/redirect target
+    targets: typing.Tuple[typing.Tuple[str, bool], ...]
+    # the valid "+" ip4/ip6 networks of the record
+    networks: typing.FrozenSet[Network]
+
+    @classmethod
+    def parse(cls, record: str) -> '_Record':
+        """Parse `record`."""
+        spf = Parser.parse(record)
+        # a redirect is ignored when there is an "all" (RFC 7208, section 6.1)
+        kinds = (Include, Redirect) if spf.redirect_applies else Include
+        return cls(spf.lookup_count(),
+                   tuple((normalize(term.domain_spec),
+                          isinstance(term, Redirect) or term.qualifier == "+")
+                         for term in spf.terms
+                         if isinstance(term, kinds)
+                         and term.domain_spec is not None and not term.has_macros),
+                   frozenset((term.BITS, term.network, term.prefix_length)
+                             for term in spf.terms
+                             if isinstance(term, IPNetwork) and term.qualifier == "+"
+                             and not term.errors
+                             and term.network is not None
+                             and term.prefix_length is not None))
+
+
+class _Frame():
+    """A record being summarized by :meth:`IncludeGraph._summarize`."""
+    __slots__ = ('domain', 'record', 'passes', 'targets', 'lookups', 'networks', 'loop')
+
+    def __init__(self, domain: str, record: str, parsed: _Record, passes: bool) -> None:
+        """Start summarizing `record` of `domain`.
+
+        `passes` specifies whether the networks of `domain` pass for the record including it.
+        """
+        self.domain = domain
+        self.record = record
+        self.passes = passes
+        # the targets still to add
+        self.targets = iter(parsed.targets)
+        self.lookups = parsed.lookups
+        self.networks = parsed.networks
+        # whether the record reaches a loop
+        self.loop = False
+
+    @property
+    def summary(self) -> Summary:
+        """The :class:`Summary` of the record, once all targets have been added."""
+        return _LOOP if self.loop else Summary(self.lookups, self.networks)
+
+    def add(self, summary: Summary, passes: bool) -> None:
+        """Add the :class:`Summary` of a target.
+
+        `passes` specifies whether the target's networks pass for this record.
+        """
+        if summary is _LOOP:
+            self.loop = True
+            return
+        self.lookups += summary.lookups
+        if not passes:
+            return
+        # share the target's set where possible, since large providers' sets are big
+        if not self.networks:
+            self.networks = summary.networks
+        elif summary.networks:
+            self.networks = self.networks | summary.networks
+
+
+def normalize(domain: str) -> str:
+    """Return the canonical form of `domain`."""
+    return domain.lower().rstrip(".")
+
+
+class IncludeGraph():
+    """Index of SPF records by domain, linked by their "include" and "redirect" targets.
+
+    Each distinct record string is parsed once, no matter how many domains publish it.
+    :class:`Summary`s are computed on demand and memoized per distinct record as well,
+    since targets are absolute domain names and thus do not depend on the publisher.
+    :meth:`update` only discards the memoized data of the records that
+    (transitively) include or redirect to the updated domain.
+
+    Targets containing macros cannot be resolved statically and are ignored
+    (though their own lookup is still counted).
+    So are redirects in records with an "all" mechanism, which evaluation ignores.
+    ip4/ip6 mechanisms with errors do not contribute networks.
+
+    An :class:`IncludeGraph` can be shared between threads; its methods are serialized by a lock.
+    """
+    def __init__(self, path: typing.Optional[str] = None) -> None:
+        """Create an :class:`IncludeGraph`.
+
+        `path` is an SQLite database in which the records are persisted.
+        Records already in it are loaded.
+        Without a `path`, the graph is only kept in memory.
+        """
+        self._records: typing.Dict[str, str] = {}
+        # parsed records by record string, shared between domains, with reference counts
+        self._parsed: typing.Dict[str, _Record] = {}
+        self._refs: typing.Counter[str] = collections.Counter()
+        # domains including or redirecting to a domain
+        self._parents: typing.DefaultDict[str, typing.Set[str]] = collections.defaultdict(set)
+        # memoized summaries by record string
+        self._summaries: typing.Dict[str, Summary] = {}
+        self._lock = threading.Lock()
+
+        self._db: typing.Optional[sqlite3.Connection] = None
+        if path is not None:
+            # only ever used while holding the lock
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute("CREATE TABLE IF NOT EXISTS records "
+                                 "(domain TEXT PRIMARY KEY, record TEXT NOT NULL)")
+            for domain, record in self._db.execute("SELECT domain, record FROM records"):
+                self._set(domain, record)
+
+    def __len__(self) -> int:
+        """Return the number of domains with a record."""
+        return len(self._records)
+
+    def close(self) -> None:
+        """Close the database, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def record(self, domain: str) -> typing.Optional[str]:
+        """Return the record of `domain`, if known."""
+        return self._records.get(normalize(domain))
+
+    def update(self, domain: str, record: typing.Optional[str]) -> None:
+        """Set the record of `domain`, or remove it if `record` is `None`."""
+        self.update_many(((domain, record),))
+
+    def update_many(self, records: typing.Iterable[typing.Tuple[str, typing.Optional[str]]]) \
+            -> None:
+        """Same as :meth:`update` for many domains, persisting them in a single transaction.
+
+        If `records` has a domain more than once, the last record wins.
+        """
+        with self._lock:
+            # the final record of each changed domain
+            changed: typing.Dict[str, typing.Optional[str]] = {}
+            for domain, record in records:
+                domain = normalize(domain)
+                if self._records.get(domain) == record:
+                    continue
+                self._unset(domain)
+                if record is not None:
+                    self._set(domain, record)
+                changed[domain] = record
+            for domain in changed:
+                self._invalidate(domain)
+
+            if self._db is not None and changed:
+                with self._db:
+                    self._db.executemany("DELETE FROM records WHERE domain = ?",
+                                         ((d,) for d, r in changed.items() if r is None))
+                    self._db.executemany("INSERT OR REPLACE INTO records VALUES (?, ?)",
+                                         ((d, r) for d, r in changed.items() if r is not None))
+
+    def summary(self, domain: str) -> typing.Optional[Summary]:
+        """Return the :class:`Summary` of `domain`, or `None` if it has no record."""
+        with self._lock:
+            return self._summarize(normalize(domain))
+
+    def lookup_count(self, domain: str) -> typing.Optional[int]:
+        """Return :attr:`Summary.lookups` of `domain`, or `None` if it has no record."""
+        summary = self.summary(domain)
+        return summary.lookups if summary is not None else None
+
+    def networks(self, domain: str) -> typing.Optional[typing.FrozenSet[Network]]:
+        """Return :attr:`Summary.networks` of `domain`, or `None` if it has no record."""
+        summary = self.summary(domain)
+        return summary.networks if summary is not None else None
+
+    def _set(self, domain: str, record: str) -> None:
+        """Add `record` for `domain`, which must not have one."""
+        self._records[domain] = record
+        parsed = self._parsed.get(record)
+        if parsed is None:
+            parsed = self._parsed[record] = _Record.parse(record)
+        self._refs[record] += 1
+        for target, _ in parsed.targets:
+            self._parents[target].add(domain)
+
+    def _unset(self, domain: str) -> None:
+        """Remove the record of `domain`, if any."""
+        record = self._records.pop(domain, None)
+        if record is None:
+            return
+        for target, _ in self._parsed[record].targets:
+            parents = self._parents[target]
+            parents.discard(domain)
+            if not parents:
+                del self._parents[target]
+        self._refs[record] -= 1
+        if not self._refs[record]:
+            del self._refs[record]
+            del self._parsed[record]
+            self._summaries.pop(record, None)
+
+    def _invalidate(self, domain: str) -> None:
+        """Discard the memoized summaries of the records of the ancestors of `domain`."""
+        stack = [domain]
+        seen = {domain}
+        while stack:
+            current = stack.pop()
+            for parent in self._parents.get(current, ()):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+                    self._summaries.pop(self._records[parent], None)
+
+    def _summarize(self, domain: str) -> typing.Optional[Summary]:
+        """Return the (memoized) :class:`Summary` of `domain`.
+
+        Include chains can be arbitrarily deep, so this walks them with an explicit stack.
+        Reaching a domain whose summary is being computed means there is a loop;
+        every record reaching it then gets the same summary, whichever domain is asked for first.
+        """
+        record = self._records.get(domain)
+        if record is None:
+            return None
+        summary = self._summaries.get(record)
+        if summary is not None:
+            return summary
+
+        stack = [_Frame(domain, record, self._parsed[record], True)]
+        visiting = {domain}
+        while True:
+            frame = stack[-1]
+            next_target = next(frame.targets, None)
+            if next_target is not None:
+                target, passes = next_target
+                if target in visiting:
+                    frame.loop = True
+                    continue
+                record = self._records.get(target)
+                if record is None:
+                    continue
+                summary = self._summaries.get(record)
+                if summary is None:
+                    stack.append(_Frame(target, record, self._parsed[record], passes))
+                    visiting.add(target)
+                else:
+                    frame.add(summary, passes)
+                continue
+
+            stack.pop()
+            visiting.remove(frame.domain)
+            summary = self._summaries[frame.record] = frame.summary
+            if not stack:
+                return summary
+            stack[-1].add(summary, frame.passes)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Opt-in parser instrumentation.
+
+Parsers look up the active :class:`Collector` once per call;
+when there is none (the default) they take their uninstrumented path.
+
+    with instrumentation.collect() as collector:
+        spf.Parser.parse(record)
+    print(collector.table())
+
+To keep the overhead bounded under load, instrument only a sample of the work
+and export the aggregate in the Prometheus text format:
+
+    with instrumentation.collect(collector, sample_rate=0.01):
+        spf.Parser.parse(record)
+    ...
+    body = collector.prometheus()
+"""
+
+import bisect
+import collections
+import contextlib
+import contextvars
+import random
+import time
+import typing
+if typing.TYPE_CHECKING:
+    # pylint: disable=cyclic-import,unused-import
+    from .cidr_length.cidr_lengths import CidrLengths  # noqa: F401
+    from .term import Term  # noqa: F401
+
+
+_T = typing.TypeVar('_T')
+
+# marks the end of an iterator in Collector.timed_iter
+_END = object()
+
+
+class Histogram():
+    """Counts of observed values by bucket, plus their sum."""
+    def __init__(self, bounds: typing.Tuple[float, ...]) -> None:
+        """Create an empty :class:`Histogram`.
+
+        `bounds` are the (ascending) upper bounds of the buckets;
+        a last bucket for everything above them is added.
+        """
+        self.bounds = bounds
+        # per-bucket (not cumulative) counts
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add `value`."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def merge(self, other: 'Histogram') -> None:
+        """Add the values observed by `other`, which must have the same bounds."""
+        assert self.bounds == other.bounds
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+
+
+class Collector():
+    """Collects per-phase timings and term/error counts.
+
+    Timings are exclusive, i.e. time spent in a nested phase
+    (e.g. "cidr-length" within "classify") is not counted for the outer phase.
+
+    A :class:`Collector` must not be shared between threads;
+    use one per thread and :meth:`merge` them for reporting.
+    """
+    # upper bounds of the parse latency histogram buckets, in seconds
+    LATENCY_BUCKETS: typing.ClassVar[typing.Tuple[float, ...]] = \
+        (10e-6, 25e-6, 50e-6, 100e-6, 250e-6, 500e-6, 1e-3, 2.5e-3, 5e-3, 10e-3)
+
+    def __init__(self) -> None:
+        """Create an empty :class:`Collector`."""
+        self.timings: typing.DefaultDict[str, float] = collections.defaultdict(float)
+        self.calls: typing.Counter[str] = collections.Counter()
+        self.terms: typing.Counter[str] = collections.Counter()
+        self.errors: typing.Counter[str] = collections.Counter()
+        # cidr-length strings parsed on their own (i.e. not as part of a term) by kind
+        self.cidr_lengths: typing.Counter[str] = collections.Counter()
+        self.latencies = Histogram(self.LATENCY_BUCKETS)
+        # [phase, start time, time spent in nested phases]
+        self._stack: typing.List[typing.List[typing.Any]] = []
+
+    @property
+    def depth(self) -> int:
+        """The number of phases currently running."""
+        return len(self._stack)
+
+    @contextlib.contextmanager
+    def phase(self, phase: str) -> typing.Iterator[None]:
+        """Time `phase` for the duration of the `with` block, even if it raises."""
+        self.start(phase)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def timed(self, phase: str, function: typing.Callable[..., _T]) -> typing.Callable[..., _T]:
+        """Wrap `function`, so that its calls are timed as `phase`."""
+        def wrapper(*args: typing.Any) -> _T:
+            with self.phase(phase):
+                return function(*args)
+        return wrapper
+
+    def timed_iter(self, phase: str, iterator: typing.Iterator[_T]) -> typing.Iterator[_T]:
+        """Wrap `iterator`, so that producing each item is timed as `phase`."""
+        while True:
+            with self.phase(phase):
+                item = next(iterator, _END)
+            if item is _END:
+                return
+            yield typing.cast(_T, item)
+
+    def start(self, phase: str) -> None:
+        """Start timing `phase`.
+
+        Prefer :meth:`phase`; every call must be paired with a :meth:`stop`.
+        """
+        self._stack.append([phase, time.perf_counter(), 0.0])
+
+    def stop(self) -> None:
+        """Stop timing the innermost phase."""
+        phase, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self.timings[phase] += elapsed - nested
+        self.calls[phase] += 1
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def observe(self, seconds: float) -> None:
+        """Add the latency of parsing a whole record."""
+        self.latencies.observe(seconds)
+
+    def merge(self, other: 'Collector') -> None:
+        """Add the data collected by `other`."""
+        for phase, seconds in other.timings.items():
+            self.timings[phase] += seconds
+        self.calls.update(other.calls)
+        self.terms.update(other.terms)
+        self.errors.update(other.errors)
+        self.cidr_lengths.update(other.cidr_lengths)
+        self.latencies.merge(other.latencies)
+
+    def count(self, terms: typing.Iterable['Term']) -> None:
+        """Count `terms` and their errors by class."""
+        for term in terms:
+            self.terms[term.__class__.__name__] += 1
+            for error in term.errors:
+                self.errors[error.__class__.__name__] += 1
+
+    def count_cidr_lengths(self, kind: str, cidr: 'CidrLengths') -> None:
+        """Count a cidr-length string of `kind` parsed on its own, and its errors by class."""
+        self.cidr_lengths[kind] += 1
+        for error in cidr.errors:
+            self.errors[error.__class__.__name__] += 1
+
+    def table(self) -> str:
+        """Format the collected data as a hot-spot table, slowest phase first."""
+        total = sum(self.timings.values()) or 1.0
+        lines = [f"{'phase':<16}{'calls':>10}{'total ms':>12}{'us/call':>10}{'share':>8}"]
+        for phase, seconds in sorted(self.timings.items(), key=lambda i: i[1], reverse=True):
+            calls = self.calls[phase]
+            lines.append(f"{phase:<16}{calls:>10}{seconds * 1e3:>12.2f}"
+                         f"{seconds * 1e6 / calls:>10.2f}{seconds / total:>8.1%}")
+        for title, counter in (("term", self.terms), ("cidr-length", self.cidr_lengths),
+                               ("error", self.errors)):
+            if not counter:
+                continue
+            lines.append("")
+            lines.append(f"{title:<26}{'count':>10}")
+            for name, count in counter.most_common():
+                lines.append(f"{name:<26}{count:>10}")
+        return "\n".join(lines)
+
+    def prometheus(self, prefix: str = "spf_parser") -> str:
+        """Format the collected data in the Prometheus text exposition format."""
+        lines: typing.List[str] = []
+
+        def counter(name: str, label: str, values: typing.Mapping[str, float],
+                    description: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for key, value in sorted(values.items()):
+                lines.append(f'{prefix}_{name}{{{label}="{key}"}} {value}')
+
+        counter("phase_seconds_total", "phase", self.timings, "Exclusive time spent per phase.")
+        counter("phase_calls_total", "phase", self.calls, "Number of times a phase ran.")
+        counter("terms_total", "class", self.terms, "Parsed terms by class.")
+        counter("cidr_lengths_total", "kind", self.cidr_lengths,
+                "cidr-length strings parsed on their own by kind.")
+        counter("errors_total", "class", self.errors, "Parsing errors by class.")
+
+        name = f"{prefix}_record_seconds"
+        lines.append(f"# HELP {name} Latency of parsing a whole SPF string.")
+        lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip(self.latencies.bounds + (float("inf"),), self.latencies.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum {self.latencies.sum}")
+        lines.append(f"{name}_count {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+_COLLECTOR: contextvars.ContextVar[typing.Optional[Collector]] = \
+    contextvars.ContextVar('collector', default=None)
+
+
+def active() -> typing.Optional[Collector]:
+    """Return the :class:`Collector` of the current context, if any."""
+    return _COLLECTOR.get()
+
+
+@contextlib.contextmanager
+def collect(collector: typing.Optional[Collector] = None,
+            sample_rate: float = 1.0) -> typing.Iterator[Collector]:
+    """Instrument parsing within the `with` block.
+
+    `collector` is the :class:`Collector` to add to; a new one is created if it is `None`.
+    `sample_rate` is the probability that the block is instrumented at all.
+    A block that is not sampled takes the uninstrumented paths.
+    """
+    if collector is None:
+        collector = Collector()
+    if sample_rate < 1.0 and random.random() >= sample_rate:
+        yield collector
+        return
+    token = _COLLECTOR.set(collector)
+    try:
+        yield collector
+    finally:
+        _COLLECTOR.reset(token)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""IP address literal parsing.
+
+These parse the address part of ip4-network and ip6-network into an `int`,
+which is cheaper than going through :mod:`ipaddress` for every term.
+"""
+
+import typing
+
+
+HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def parse_ip4(string: str) -> typing.Optional[int]:
+    """Parse an ip4-network (RFC 7208, section 5.6).
+
+    Each of the four dotted numbers must be in [0..255] and must not be 0-padded.
+
+    Returns the address as an `int` or `None` if `string` is not a valid address.
+    """
+    parts = string.split(".")
+    if len(parts) != 4:
+        return None
+    address = 0
+    for part in parts:
+        if not part or len(part) > 3 or not (part.isascii() and part.isdigit()):
+            return None
+        if part[0] == "0" and len(part) > 1:
+            return None
+        number = int(part)
+        if number > 255:
+            return None
+        address = address << 8 | number
+    return address
+
+
+def _parse_ip6_groups(string: str, last: bool) -> typing.Optional[typing.List[int]]:
+    """Parse colon-separated 16-bit groups.
+
+    `string` is the part of an address before or after "::" (or the whole address).
+    `last` specifies whether `string` ends the address and thus may end with an IPv4 address.
+
+    Returns the groups or `None` if `string` is invalid.
+    """
+    if not string:
+        return []
+    parts = string.split(":")
+    groups = []
+    if last and "." in parts[-1]:
+        ip4 = parse_ip4(parts.pop())
+        if ip4 is None:
+            return None
+        tail = [ip4 >> 16, ip4 & 0xffff]
+    else:
+        tail = []
+    for part in parts:
+        if not part or len(part) > 4 or not HEX_DIGITS.issuperset(part):
+            return None
+        groups.append(int(part, 16))
+    groups.extend(tail)
+    return groups
+
+
+def parse_ip6(string: str) -> typing.Optional[int]:
+    """Parse an ip6-network (RFC 7208, section 5.6, referring to RFC 4291, section 2.2).
+
+    This accepts all three textual forms,
+    including "::" compression and a trailing dotted IPv4 address (e.g. "::ffff:192.0.2.1").
+
+    Returns the address as an `int` or `None` if `string` is not a valid address.
+    """
+    head, compressed, tail = string.partition("::")
+    if compressed and "::" in tail:
+        return None
+    head_groups = _parse_ip6_groups(head, not compressed)
+    if head_groups is None:
+        return None
+    if compressed:
+        tail_groups = _parse_ip6_groups(tail, True)
+        if tail_groups is None:
+            return None
+        # "::" stands for at least one group of zeros
+        missing = 8 - len(head_groups) - len(tail_groups)
+        if missing < 1:
+            return None
+        groups = head_groups + [0] * missing + tail_groups
+    elif len(head_groups) != 8:
+        return None
+    else:
+        groups = head_groups
+    address = 0
+    for group in groups:
+        address = address << 16 | group
+    return address
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""DNS lookup limits (RFC 7208, section 4.6.4)."""
+
+
+# terms causing DNS queries per check_host() evaluation, including nested ones
+LOOKUP_LIMIT = 10
+
+# MX names whose addresses are looked up per "mx" mechanism; exceeding it is a permerror
+MX_LIMIT = 10
+
+# PTR names forward-confirmed per "ptr" mechanism or %{p} macro; the rest are ignored
+PTR_LIMIT = 10
+
+# lookups with no answers (NODATA or NXDOMAIN) per evaluation
+VOID_LOOKUP_LIMIT = 2
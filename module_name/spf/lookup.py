@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Concurrent follow-up lookups of the "mx" and "ptr" mechanisms.
+
+An "mx" mechanism looks up the addresses of up to 10 MX names,
+a "ptr" mechanism forward-confirms up to 10 PTR names.
+Rather than one after another, these queries are issued concurrently,
+bounded by the concurrency cap of the :class:`Evaluation`.
+
+Results are still consumed in the order a sequential evaluation would see them,
+so that the limits of RFC 7208, section 4.6.4 are enforced exactly:
+a match ends the mechanism (and cancels the queries still running) only once
+all the answers before it have been accounted for,
+since any of them could exceed the void lookup limit or fail.
+
+    evaluation = lookup.Evaluation(resolver, max_concurrency=8)
+    matched = await lookup.mx_match(evaluation, "example.org", address, 32)
+"""
+
+import asyncio
+import typing
+from .ip_address import (parse_ip4, parse_ip6)
+from .limits import (LOOKUP_LIMIT, MX_LIMIT, PTR_LIMIT, VOID_LOOKUP_LIMIT)
+
+
+class DNSError(RuntimeError):
+    """A DNS query failed other than with NXDOMAIN (i.e. a "temperror")."""
+    pass
+
+
+class LimitError(RuntimeError):
+    """A limit of RFC 7208, section 4.6.4 was exceeded (i.e. a "permerror")."""
+    def __init__(self, kind: str, limit: int) -> None:
+        """Create a :class:`LimitError`.
+
+        `kind` specifies what was limited (e.g. "void lookups").
+        `limit` is the value of the limit.
+        """
+        super().__init__(f"More than {limit} {kind}.")
+        self.kind = kind
+        self.limit = limit
+
+
+class Resolver(typing.Protocol):
+    """A DNS stub resolver."""
+    async def query(self, name: str, rdtype: str) -> typing.Sequence[str]:
+        """Look up the records of type `rdtype` (e.g. "MX") of `name`.
+
+        Returns the answers in presentation format; for "MX" only the exchange names.
+        A NODATA or NXDOMAIN answer is an empty sequence.
+
+        Raises a :exc:`DNSError` on any other failure.
+        """
+        ...
+
+
+class Evaluation():
+    """The DNS lookups of a single check_host() evaluation.
+
+    This counts the terms causing lookups and the void lookups against their limits,
+    and caps the number of concurrent queries.
+    """
+    def __init__(self, resolver: Resolver, max_concurrency: int = 8,
+                 lookup_limit: int = LOOKUP_LIMIT,
+                 void_lookup_limit: int = VOID_LOOKUP_LIMIT) -> None:
+        """Create an :class:`Evaluation`.
+
+        `resolver` performs the queries.
+        `max_concurrency` is the maximum number of queries running at once.
+        `lookup_limit` and `void_lookup_limit` default to the limits RFC 7208 recommends.
+        """
+        assert max_concurrency > 0
+        self.resolver = resolver
+        self.lookup_limit = lookup_limit
+        self.void_lookup_limit = void_lookup_limit
+        self.lookups = 0
+        self.void_lookups = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def count_term(self) -> None:
+        """Count a term causing DNS lookups.
+
+        Raises a :exc:`LimitError` when there are more than :attr:`lookup_limit`.
+        """
+        self.lookups += 1
+        if self.lookups > self.lookup_limit:
+            raise LimitError("DNS lookups", self.lookup_limit)
+
+    def count_answers(self, answers: typing.Sequence[str]) -> None:
+        """Count the answers to a query, i.e. a void lookup if there are none.
+
+        Raises a :exc:`LimitError` when there are more than :attr:`void_lookup_limit`.
+        """
+        if answers:
+            return
+        self.void_lookups += 1
+        if self.void_lookups > self.void_lookup_limit:
+            raise LimitError("void lookups", self.void_lookup_limit)
+
+    async def query(self, name: str, rdtype: str) -> typing.Sequence[str]:
+        """Query :attr:`resolver`, waiting for a free slot first.
+
+        The answers are not counted; see :meth:`count_answers`.
+        """
+        async with self._semaphore:
+            return await self.resolver.query(name, rdtype)
+
+
+def address_type(bits: int) -> typing.Tuple[str, typing.Callable[[str], typing.Optional[int]]]:
+    """Return the record type holding addresses of `bits` bits and its parser."""
+    return ("A", parse_ip4) if bits == 32 else ("AAAA", parse_ip6)
+
+
+def reverse_name(address: int, bits: int) -> str:
+    """Return the name of the PTR records of `address` (of `bits` bits)."""
+    if bits == 32:
+        return ".".join(str(address >> shift & 0xff) for shift in range(0, 32, 8)) \
+            + ".in-addr.arpa"
+    return ".".join(f"{address >> shift & 0xf:x}" for shift in range(0, 128, 4)) + ".ip6.arpa"
+
+
+def _in_domain(name: str, domain: str) -> bool:
+    """Check if `name` is `domain` or a subdomain of it."""
+    name = name.lower().rstrip(".")
+    domain = domain.lower().rstrip(".")
+    return name == domain or name.endswith("." + domain)
+
+
+async def _first_match(evaluation: Evaluation, names: typing.Sequence[str], rdtype: str,
+                       matches: typing.Callable[[typing.Sequence[str]], bool],
+                       skip_errors: bool) -> bool:
+    """Query `names` concurrently and check the answers in order.
+
+    `matches` decides whether the answers of a name match.
+    `skip_errors` specifies whether names whose query fails are skipped;
+    otherwise the :exc:`DNSError` is raised.
+
+    Returns whether any name matched. Queries not needed anymore are cancelled.
+    """
+    tasks = [asyncio.ensure_future(evaluation.query(name, rdtype)) for name in names]
+    try:
+        for task in tasks:
+            try:
+                answers = await task
+            except DNSError:
+                if skip_errors:
+                    continue
+                raise
+            evaluation.count_answers(answers)
+            if matches(answers):
+                return True
+        return False
+    finally:
+        for task in tasks:
+            task.cancel()
+        # wait for the cancellations, retrieving the errors nobody is interested in
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def mx_match(evaluation: Evaluation, domain: str, address: int, bits: int,
+                   prefix_length: typing.Optional[int] = None) -> bool:
+    """Evaluate an "mx" mechanism (RFC 7208, section 5.4).
+
+    `domain` is the <target-name>.
+    `address` is the <ip> as an `int` of `bits` (32 or 128) bits.
+    `prefix_length` is the cidr-length for `bits`, the full length if it is `None`.
+
+    Returns whether any address of an MX name is in the network.
+
+    Raises a :exc:`LimitError` if there are more than :data:`limits.MX_LIMIT` MX names,
+    or evaluation exceeds a limit of `evaluation`,
+    and a :exc:`DNSError` if a query fails.
+    """
+    evaluation.count_term()
+    names = await evaluation.query(domain, "MX")
+    evaluation.count_answers(names)
+    if len(names) > MX_LIMIT:
+        raise LimitError("MX names", MX_LIMIT)
+
+    rdtype, parse = address_type(bits)
+    shift = bits - (bits if prefix_length is None else prefix_length)
+    network = address >> shift
+
+    def matches(answers: typing.Sequence[str]) -> bool:
+        return any(a is not None and a >> shift == network for a in map(parse, answers))
+
+    return await _first_match(evaluation, names, rdtype, matches, False)
+
+
+async def ptr_match(evaluation: Evaluation, domain: str, address: int, bits: int) -> bool:
+    """Evaluate a "ptr" mechanism (RFC 7208, section 5.5).
+
+    `domain` is the <target-name>.
+    `address` is the <ip> as an `int` of `bits` (32 or 128) bits.
+
+    Returns whether a PTR name of `address` is `domain` or within it,
+    and has `address` among its addresses.
+    Only the first :data:`limits.PTR_LIMIT` PTR names are considered,
+    and of those only the ones within `domain` are forward-confirmed,
+    as no other name can make the mechanism match.
+    A failing PTR query does not match; names whose query fails are skipped.
+
+    Raises a :exc:`LimitError` if evaluation exceeds a limit of `evaluation`.
+    """
+    evaluation.count_term()
+    try:
+        names = await evaluation.query(reverse_name(address, bits), "PTR")
+    except DNSError:
+        return False
+    evaluation.count_answers(names)
+
+    rdtype, parse = address_type(bits)
+    candidates = [name for name in names[:PTR_LIMIT] if _in_domain(name, domain)]
+
+    def matches(answers: typing.Sequence[str]) -> bool:
+        return any(parse(answer) == address for answer in answers)
+
+    return await _first_match(evaluation, candidates, rdtype, matches, True)
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""macro-string inspection."""
+
+import typing
+from module_name.lazy_pattern import LazyPattern
+
+
+# "%%", "%_" and "%-" are escapes, "%{" starts a macro-expand
+MACRO_RE = LazyPattern(r"%(?:\{([a-zA-Z])|.)")
+
+# macro-letters that expand to parts of the sender or the HELO identity (RFC 7208, section 7.2)
+SENDER_LETTERS: typing.FrozenSet[str] = frozenset("slh")
+
+
+def macro_letters(string: str) -> typing.FrozenSet[str]:
+    """Return the (lowercased) macro-letters used in the macro-string `string`."""
+    if "%" not in string:
+        return frozenset()
+    return frozenset(m.group(1).lower() for m in MACRO_RE.compiled.finditer(string) if m.group(1))
@@ -2,19 +2,20 @@
 """Defines :class:`Modifier`."""
 
 
-import collections
-import re
+import types
 import typing
-from .error import UnknownModifierError
+from module_name.lazy_pattern import LazyPattern
+from .error import (MissingArgumentError, UnknownModifierError)
 from .term import Term
 
 
 # FIXME: quite similar to Directive; unify?
 class Modifier(Term):
     """Abstract modifier."""
-    MODIFIER_RE: typing.ClassVar[typing.Pattern[str]] = re.compile(fr"({Term.NAME_PATTERN})=(.*)")
+    MODIFIER_RE = LazyPattern(fr"({Term.NAME_PATTERN})=(.*)")
 
-    HANDLERS: typing.ClassVar[typing.DefaultDict[str, typing.Type['Modifier']]]
+    # read-only, so that it can be shared between threads
+    HANDLERS: typing.ClassVar[typing.Mapping[str, typing.Type['Modifier']]]
 
     def __init__(self, match: typing.Match[str]) -> None:
         super().__init__(match.group(0))
@@ -27,12 +28,27 @@ class Modifier(Term):
             return None
 
         name = match.group(1)
-        return cls.HANDLERS[name](match)
+        return cls.HANDLERS.get(name, Unknown)(match)
 
 
 class Redirect(Modifier):
     """"redirect" modifier."""
-    pass
+    DNS_LOOKUPS: typing.ClassVar[int] = 1
+
+    def __init__(self, match: typing.Match[str]) -> None:
+        super().__init__(match)
+        if not self.arg:
+            self._errors.append(MissingArgumentError(self))
+
+    @property
+    def domain_spec(self) -> typing.Optional[str]:
+        """The domain-spec, or `None` if it is missing."""
+        return self.arg or None
+
+    @property
+    def has_macros(self) -> bool:
+        """Whether :attr:`domain_spec` needs macro expansion."""
+        return "%" in self.arg
 
 
 class Explanation(Modifier):
@@ -47,15 +63,7 @@ class Unknown(Modifier):
         self._errors.append(UnknownModifierError(self))
 
 
-Modifier.HANDLERS = collections.defaultdict(lambda: Unknown,
-                                            redirect=Redirect,
-                                            exp=Explanation,
-                                           )
-
-
-if __debug__:
-    def mod_name_checker() -> None:
-        mod_name = re.compile(Term.NAME_PATTERN)
-        for modifier in Modifier.HANDLERS.keys():
-            assert mod_name.fullmatch(modifier), f"{modifier} must match {mod_name.pattern}"
-    mod_name_checker()
+Modifier.HANDLERS = types.MappingProxyType({
+    'redirect': Redirect,
+    'exp': Explanation,
+})
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """cidr-length parser."""
 
+import time
 import typing
 from module_name.parsing_string import ParsingString
+from . import instrumentation
 from .directive import Directive
 from .modifier import Modifier
 from .spacing import Spacing
@@ -22,6 +24,7 @@ class Parser():
     @staticmethod
     def term_iter(string: str, terms: typing.List[Term]) \
             -> typing.Generator[str, None, None]:
+        """Yield the terms of `string`, appending the spacing between them to `terms`."""
         match = Term.TERM_RE.match(string)
         view = ParsingString(string)
         while match:
@@ -32,27 +35,56 @@ class Parser():
             match = Term.TERM_RE.match(str(view))
         # TODO: if view: error
 
+    @staticmethod
+    def classify(term: str) -> Term:
+        """Turn a term string (other than the version) into a :class:`Term`."""
+        modifier = Modifier.parse(term)
+        if modifier:
+            return modifier
+        directive = Directive.parse(term)
+        if directive:
+            return directive
+        return UnknownTerm(term)
+
     @classmethod
     def parse(cls, string: str) -> SPF:
+        """Parse the SPF string `string`.
+
+        If there is an active :class:`instrumentation.Collector`, parsing is recorded into it.
+        """
+        collector = instrumentation.active()
+        if collector is None:
+            return cls._parse(string, None)
+
+        outermost = collector.depth == 0
+        start = time.perf_counter()
+        spf = cls._parse(string, collector)
+        if outermost:
+            collector.observe(time.perf_counter() - start)
+            collector.count(spf.terms)
+        return spf
+
+    @classmethod
+    def _parse(cls, string: str, collector: typing.Optional[instrumentation.Collector]) -> SPF:
+        """Same as :meth:`parse`, timing the phases in `collector` unless it is `None`."""
         terms: typing.List[Term] = []
 
-        term_iter = cls.term_iter(string, terms)
-        term = next(term_iter, None)
+        tokens: typing.Iterator[str] = cls.term_iter(string, terms)
+        version: typing.Callable[[str], Term] = Version
+        classify = cls.classify
+        if collector is not None:
+            tokens = collector.timed_iter("tokenize", tokens)
+            version = collector.timed("classify", version)
+            classify = collector.timed("classify", classify)
+
+        term = next(tokens, None)
         if term is None:
             return SPF([UnknownTerm(string)])
         # TODO: If the version isn't present we might want to check if it's something else instead.
         #       Note that the version does have to come first though.
-        terms.append(Version(term))
-
-        for term in term_iter:
-            directive = Modifier.parse(term)
-            if directive:
-                terms.append(directive)
-                continue
-            modifier = Directive.parse(term)
-            if modifier:
-                terms.append(modifier)
-                continue
-            terms.append(UnknownTerm(term))
+        terms.append(version(term))
+
+        for term in tokens:
+            terms.append(classify(term))
 
         return SPF(terms)
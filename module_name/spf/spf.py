@@ -2,11 +2,19 @@
 
 import itertools
 import typing
+from .directive import (Address, All, DomainDirective, Include, MailExchange)
 from .error import ParsingError
+from .macro import macro_letters
+from .modifier import (Explanation, Redirect)
 from .term import Term
 
 
 class SPF:
+    # terms whose target is worth prefetching,
+    # i.e. that always cause a lookup of their domain-spec when evaluated
+    PREFETCH_TYPES: typing.ClassVar[typing.Tuple[typing.Type[DomainDirective], ...]] = \
+        (Include, Address, MailExchange)
+
     def __init__(self, terms: typing.List[Term]) -> None:
         self.terms = terms
 
@@ -16,3 +24,63 @@ class SPF:
     @property
     def errors(self) -> typing.Iterator[ParsingError]:
         return itertools.chain(*(term.errors for term in self.terms))
+
+    @property
+    def redirect_applies(self) -> bool:
+        """Whether a "redirect" modifier would be evaluated.
+
+        It is ignored if there is an "all" mechanism (RFC 7208, section 6.1).
+        """
+        return not any(isinstance(term, All) for term in self.terms)
+
+    def lookup_count(self) -> int:
+        """Return the number of DNS lookups the terms of this record count against the limit.
+
+        Lookups caused by records reached through "include" or "redirect" are not included.
+        """
+        redirect_applies = self.redirect_applies
+        return sum(term.DNS_LOOKUPS for term in self.terms
+                   if redirect_applies or not isinstance(term, Redirect))
+
+    def prefetch_targets(self) -> typing.List[typing.Tuple[Term, str]]:
+        """Return the names evaluation will look up, in the order it needs them.
+
+        These are the targets of "include", "a" and "mx" mechanisms in term order,
+        followed by the target of "redirect", which is only evaluated after all mechanisms
+        (and not at all if there is an "all" mechanism).
+        Terms without an explicit domain-spec or with macros are left out,
+        since their target depends on the evaluation.
+
+        Returns a `list` of tuples (
+
+            * the term that needs the lookup
+            * its domain-spec
+
+        ).
+        """
+        targets: typing.List[typing.Tuple[Term, str]] = []
+        redirects: typing.List[typing.Tuple[Term, str]] = []
+        for term in self.terms:
+            if isinstance(term, self.PREFETCH_TYPES):
+                if term.domain_spec is not None and not term.has_macros:
+                    targets.append((term, term.domain_spec))
+            elif isinstance(term, Redirect):
+                if term.domain_spec is not None and not term.has_macros:
+                    redirects.append((term, term.domain_spec))
+        return targets + redirects if self.redirect_applies else targets
+
+    def macro_letters(self) -> typing.FrozenSet[str]:
+        """Return the macro-letters used anywhere in this record.
+
+        The result of evaluating a record that uses any of :data:`macro.SENDER_LETTERS`
+        depends on more than the domain and the client IP.
+        Note that this does not cover records reached through "include" or "redirect".
+        """
+        letters: typing.Set[str] = set()
+        for term in self.terms:
+            if isinstance(term, (DomainDirective, Redirect)):
+                if term.domain_spec is not None:
+                    letters |= macro_letters(term.domain_spec)
+            elif isinstance(term, Explanation):
+                letters |= macro_letters(term.arg)
+        return frozenset(letters)
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 """Defined :class:`Term`."""
 
-import re
 import typing
+from module_name.lazy_pattern import LazyPattern
 from .error import (ParsingError, UnknownTermError)
 
 
@@ -14,7 +14,10 @@ class Term:
 
     # FIXME: RFC5234 space separation
     #        version *( 1*SP term ) *SP
-    TERM_RE: typing.ClassVar[typing.Pattern[str]] = re.compile(r"([^ ]+)([ ]*)")
+    TERM_RE = LazyPattern(r"([^ ]+)([ ]*)")
+
+    # number of DNS lookups evaluating this term counts against limits.LOOKUP_LIMIT
+    DNS_LOOKUPS: typing.ClassVar[int] = 0
 
     # s/ParsingError/TermError/?
     _errors: typing.List[ParsingError]
@@ -2,8 +2,7 @@
 """Defines :class:`Version'."""
 
 
-import re
-import typing
+from module_name.lazy_pattern import LazyPattern
 from .error import SPFVersionError
 from .term import Term
 
@@ -14,7 +13,7 @@ class Version(Term):
     Strictly speaking, this is not a term in RFC parlance,
     but it makes sense for us to treat it this way.
     """
-    SPF_VERSION_RE: typing.ClassVar[typing.Pattern] = re.compile(r"v=spf1")
+    SPF_VERSION_RE = LazyPattern(r"v=spf1")
 
     def __init__(self, term: str) -> None:
         super().__init__(term)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Tests for :mod:`module_name.dkim.canonicalization`."""
+
+import asyncio
+import hashlib
+import random
+import re
+import typing
+import pytest
+from module_name.dkim import canonicalization
+
+
+def whole_simple(body: bytes) -> bytes:
+    """Whole-buffer "simple" body canonicalization (RFC 6376, section 3.4.3)."""
+    while body.endswith(b"\r\n"):
+        body = body[:-2]
+    return body + b"\r\n"
+
+
+def whole_relaxed(body: bytes) -> bytes:
+    """Whole-buffer "relaxed" body canonicalization (RFC 6376, section 3.4.4)."""
+    lines = [re.sub(rb"[ \t]+", b" ", re.sub(rb"[ \t]+\Z", b"", line))
+             for line in body.split(b"\r\n")]
+    while lines and not lines[-1]:
+        lines.pop()
+    return b"".join(line + b"\r\n" for line in lines)
+
+
+WHOLE = {
+    'simple': whole_simple,
+    'relaxed': whole_relaxed,
+}
+
+ALPHABET = [b"a", b"b", b" ", b"\t", b"\r", b"\n", b"\r\n", b"\r\n"]
+
+
+def split(body: bytes, rng: random.Random) -> typing.List[memoryview]:
+    """Split `body` at random positions."""
+    cuts = sorted(rng.randint(0, len(body)) for _ in range(rng.randint(0, 5)))
+    return [memoryview(body)[a:b] for a, b in zip([0] + cuts, cuts + [len(body)])]
+
+
+@pytest.mark.parametrize('name', sorted(WHOLE))
+def test_random_splits(name: str) -> None:
+    rng = random.Random(name)
+    for _ in range(5000):
+        body = b"".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 24)))
+        limit = rng.choice([None, 0, 3, 10])
+        expected = WHOLE[name](body)
+        if limit is not None:
+            expected = expected[:limit]
+        chunks = split(body, rng)
+        assert canonicalization.body_hash(chunks, name, 'sha256', limit) \
+            == hashlib.sha256(expected).digest(), (body, [bytes(c) for c in chunks], limit)
+
+
+@pytest.mark.parametrize('name,body,expected', [
+    ('simple', b"", b"\r\n"),
+    ('simple', b"\r\n\r\n", b"\r\n"),
+    ('simple', b"a  \r\n\r\n", b"a  \r\n"),
+    ('relaxed', b"", b""),
+    ('relaxed', b" \t\r\n\r\n", b""),
+    ('relaxed', b" a \t b \r\n\r\n", b" a b\r\n"),
+])
+def test_rfc_examples(name: str, body: bytes, expected: bytes) -> None:
+    assert canonicalization.body_hash([body], name, 'sha256') == hashlib.sha256(expected).digest()
+
+
+def test_length() -> None:
+    canonicalizer = canonicalization.RelaxedBodyCanonicalizer(hashlib.sha256(), 4)
+    canonicalizer.update(b"abc  \r\n")
+    canonicalizer.update(b"def\r\n")
+    assert canonicalizer.digest() == hashlib.sha256(b"abc\r").digest()
+    assert canonicalizer.length == 4
+
+
+class BytesReader():
+    """A minimal asynchronous reader."""
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    async def read(self, n: int = -1) -> bytes:
+        chunk, self.data = self.data[:n], self.data[n:]
+        return chunk
+
+
+def test_async() -> None:
+    body = b"x \t\r\n" * 1000 + b"\r\n"
+    digest = asyncio.run(canonicalization.async_body_hash(BytesReader(body), 'relaxed',
+                                                          'sha256', chunk_size=7))
+    assert digest == hashlib.sha256(whole_relaxed(body)).digest()
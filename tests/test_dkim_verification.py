@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Tests for :mod:`module_name.dkim.verification` and :mod:`module_name.dkim.key`."""
+
+import base64
+import concurrent.futures
+import os
+import typing
+import pytest
+from module_name import dkim
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "dkim")
+
+
+def fixture(name: str) -> bytes:
+    """Return the contents of a fixture file."""
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+MESSAGE = fixture("message")
+KEYS = {bits: dkim.PublicKey.from_der(fixture(f"key{bits}.der")) for bits in (512, 1024, 2048)}
+
+
+def der_integer(value: int) -> bytes:
+    """DER-encode a non-negative INTEGER."""
+    data = value.to_bytes(value.bit_length() // 8 + 1, 'big')
+    return der_tlv(0x02, data)
+
+
+def der_tlv(tag: int, value: bytes) -> bytes:
+    """DER-encode a TLV."""
+    if len(value) < 0x80:
+        return bytes((tag, len(value))) + value
+    length = len(value).to_bytes((len(value).bit_length() + 7) // 8, 'big')
+    return bytes((tag, 0x80 | len(length))) + length + value
+
+
+def test_key_sizes() -> None:
+    assert {bits: key.bits for bits, key in KEYS.items()} == {512: 512, 1024: 1024, 2048: 2048}
+
+
+@pytest.mark.parametrize('bits', [1024, 2048])
+def test_sha256_accepted(bits: int) -> None:
+    signature = fixture(f"sha256-key{bits}.sig")
+    assert dkim.verify('rsa-sha256', KEYS[bits], signature, MESSAGE)
+
+
+@pytest.mark.parametrize('bits', [1024, 2048])
+def test_tampered_message(bits: int) -> None:
+    signature = fixture(f"sha256-key{bits}.sig")
+    assert not dkim.verify('rsa-sha256', KEYS[bits], signature, MESSAGE + b"x")
+    tampered = bytes((signature[0] ^ 1,)) + signature[1:]
+    assert not dkim.verify('rsa-sha256', KEYS[bits], tampered, MESSAGE)
+
+
+def test_sha1_rejected() -> None:
+    with pytest.raises(dkim.AlgorithmError):
+        dkim.verify('rsa-sha1', KEYS[2048], fixture("sha1-key2048.sig"), MESSAGE)
+
+
+def test_short_key_rejected() -> None:
+    with pytest.raises(dkim.KeySizeError) as e:
+        dkim.verify('rsa-sha256', KEYS[512], fixture("sha256-key512.sig"), MESSAGE)
+    assert e.value.bits == 512
+
+
+def test_long_key_rejected() -> None:
+    key = dkim.PublicKey((1 << 8200) + 1, 65537)
+    with pytest.raises(dkim.KeySizeError):
+        dkim.verify('rsa-sha256', key, b"", MESSAGE)
+    der = der_tlv(0x30, der_integer(key.modulus) + der_integer(key.exponent))
+    with pytest.raises(dkim.InvalidKeyError):
+        dkim.PublicKey.from_der(der)
+
+
+def test_large_exponent_rejected() -> None:
+    key = dkim.PublicKey(KEYS[2048].modulus, (1 << 64) + 1)
+    with pytest.raises(dkim.InvalidKeyError):
+        dkim.verify('rsa-sha256', key, b"", MESSAGE)
+    der = der_tlv(0x30, der_integer(key.modulus) + der_integer(key.exponent))
+    with pytest.raises(dkim.InvalidKeyError):
+        dkim.PublicKey.from_der(der)
+
+
+def test_bare_rsa_public_key() -> None:
+    key = KEYS[2048]
+    der = der_tlv(0x30, der_integer(key.modulus) + der_integer(key.exponent))
+    decoded = dkim.PublicKey.from_der(der)
+    assert (decoded.modulus, decoded.exponent) == (key.modulus, key.exponent)
+
+
+class Clock():
+    """A settable clock."""
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_key_cache_ttl() -> None:
+    clock = Clock()
+    cache = dkim.KeyCache(clock=clock)
+    value = base64.b64encode(fixture("key2048.der")).decode()
+    fetches: typing.List[typing.Tuple[str, str]] = []
+
+    def fetch(selector: str, domain: str) -> typing.Tuple[str, float]:
+        fetches.append((selector, domain))
+        return value, 300
+
+    first = cache.get('sel', 'Example.com', fetch)
+    assert cache.get('sel', 'example.com', fetch) is first
+    assert len(fetches) == 1
+    clock.now = 301
+    assert cache.get('sel', 'example.com', fetch) is not first
+    assert len(fetches) == 2
+
+
+def test_key_cache_bounded() -> None:
+    clock = Clock()
+    cache = dkim.KeyCache(max_entries=3, clock=clock)
+    value = base64.b64encode(fixture("key2048.der")).decode()
+    fetches: typing.List[str] = []
+
+    def fetch(selector: str, domain: str) -> typing.Tuple[str, float]:
+        fetches.append(selector)
+        return value, 300
+
+    for selector in "abcd":
+        cache.get(selector, 'example.com', fetch)
+    assert len(cache) == 3
+    # "a" was evicted, "b".."d" are still cached
+    cache.get('b', 'example.com', fetch)
+    assert fetches == list("abcd")
+    cache.get('a', 'example.com', fetch)
+    assert fetches == list("abcda")
+    # expired entries go first
+    clock.now = 301
+    cache.get('e', 'example.com', fetch)
+    assert len(cache) == 1
+
+
+def test_batch_process_pool() -> None:
+    jobs = [dkim.Job('rsa-sha256', KEYS[bits], fixture(f"sha256-key{bits}.sig"), MESSAGE)
+            for bits in (1024, 2048)] * 50
+    jobs.append(dkim.Job('rsa-sha1', KEYS[2048], fixture("sha1-key2048.sig"), MESSAGE))
+    jobs.append(dkim.Job('rsa-sha256', KEYS[2048], fixture("sha256-key2048.sig"), b""))
+    with concurrent.futures.ProcessPoolExecutor(2) as executor:
+        results = dkim.verify_batch(jobs, executor, chunksize=8)
+    assert results[:-2] == [True] * 100
+    assert isinstance(results[-2], dkim.AlgorithmError)
+    assert results[-1] is False
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Keep importing the packages cheap."""
+
+import subprocess
+import sys
+import pytest
+import module_name
+import module_name.dkim
+
+
+# cold import budgets: the total self time of the package's modules in microseconds,
+# about 2.5 times what they take on a developer machine
+BUDGETS_US = {
+    'module_name.spf': 50_000,  # about 20 ms
+    'module_name.spf.lookup': 60_000,  # about 24 ms, mostly module_name.spf
+    'module_name.dkim.canonicalization': 15_000,  # about 5.5 ms
+    'module_name.dkim.verification': 18_000,  # about 6.5 ms
+}
+MODULES = sorted(BUDGETS_US)
+
+
+def run(code: str) -> subprocess.CompletedProcess:  # type: ignore[type-arg]
+    """Run `code` in a fresh interpreter."""
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, check=True)
+
+
+def import_time(module: str) -> int:
+    """Return the total self time of the package's modules when importing `module`."""
+    total = 0
+    for line in run(f"import {module}").stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip().startswith('module_name'):
+            total += int(fields[0].split(":")[1])
+    return total
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_import_time_budget(module: str) -> None:
+    # the best of a few runs, to filter out noise (and writing the bytecode cache)
+    total = min(import_time(module) for _ in range(3))
+    assert 0 < total < BUDGETS_US[module]
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_import_does_not_compile_patterns(module: str) -> None:
+    code = f"""if True:
+        import re, sys
+        compile = re.compile
+        def counting_compile(*args, **kwargs):
+            if sys._getframe(1).f_globals.get('__name__', '').startswith('module_name'):
+                print(args[0])
+            return compile(*args, **kwargs)
+        re.compile = counting_compile
+        import {module}
+    """
+    assert run(code).stdout == ""
+
+
+def test_import_is_lazy() -> None:
+    code = """if True:
+        import sys
+        import module_name
+        print(sorted(m for m in sys.modules if m.startswith('module_name.')))
+    """
+    assert run(code).stdout.strip() == "[]"
+
+
+def test_exports_match_all() -> None:
+    assert sorted(module_name.__all__) == sorted(module_name.SUBPACKAGES)
+    assert sorted(module_name.dkim.__all__) == sorted(module_name.dkim.EXPORTS)
+    for name in module_name.dkim.__all__:
+        assert getattr(module_name.dkim, name).__module__ == \
+            f"module_name.dkim.{module_name.dkim.EXPORTS[name]}"
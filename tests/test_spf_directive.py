@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Tests for :mod:`module_name.spf.directive`."""
+
+import typing
+import pytest
+from module_name import spf
+from module_name.spf.directive import (
+    Address,
+    All,
+    Directive,
+    Include,
+    IP4Address,
+    MailExchange,
+    Unknown,
+)
+
+
+def directive(term: str) -> Directive:
+    """Parse a single directive."""
+    result = spf.Parser.parse(f"v=spf1 {term}").terms[-1]
+    assert isinstance(result, Directive)
+    return result
+
+
+@pytest.mark.parametrize('term,cls,qualifier', [
+    ("all", All, "+"),
+    ("+all", All, "+"),
+    ("-all", All, "-"),
+    ("~all", All, "~"),
+    ("?all", All, "?"),
+    ("?include:x", Include, "?"),
+    ("-ip4:192.0.2.1", IP4Address, "-"),
+    ("~foo", Unknown, "~"),
+])
+def test_qualifier(term: str, cls: typing.Type[Directive], qualifier: str) -> None:
+    result = directive(term)
+    assert isinstance(result, cls)
+    assert result.qualifier == qualifier
+    assert str(result) == term
+
+
+@pytest.mark.parametrize('term,cls,domain_spec,ip4,ip6', [
+    ("a", Address, None, None, None),
+    ("a/24", Address, None, 24, None),
+    ("mx/24", MailExchange, None, 24, None),
+    ("-mx//64", MailExchange, None, None, 64),
+    ("a/24//64", Address, None, 24, 64),
+    ("a:example.org/24//64", Address, "example.org", 24, 64),
+    ("~mx:example.org", MailExchange, "example.org", None, None),
+])
+def test_dual_cidr_length(term: str, cls: typing.Type[Directive], domain_spec: typing.Optional[str],
+                          ip4: typing.Optional[int], ip6: typing.Optional[int]) -> None:
+    result = directive(term)
+    assert isinstance(result, cls)
+    assert not list(result.errors)
+    assert getattr(result, 'domain_spec') == domain_spec
+    cidr_lengths = getattr(result, 'cidr_lengths')
+    if ip4 is None and ip6 is None:
+        assert cidr_lengths is None
+    else:
+        assert (cidr_lengths.ip4, cidr_lengths.ip6) == (ip4, ip6)
+
+
+@pytest.mark.parametrize('term,errors', [
+    ("a/33", ['InvalidRangeError']),
+    ("a:/24", ['MissingArgumentError']),
+    ("all/24", ['InvalidArgumentError']),
+    ("include/24", ['InvalidArgumentError', 'MissingArgumentError']),
+    ("foo/24", ['UnknownDirectiveError']),
+])
+def test_cidr_length_errors(term: str, errors: typing.List[str]) -> None:
+    assert [error.__class__.__name__ for error in directive(term).errors] == errors
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""Check the directive and modifier handler tables."""
+
+import re
+import typing
+import pytest
+from module_name.spf.directive import Directive
+from module_name.spf.modifier import Modifier
+from module_name.spf.term import Term
+
+
+@pytest.mark.parametrize('handlers', [Directive.HANDLERS, Modifier.HANDLERS],
+                         ids=['directive', 'modifier'])
+def test_names_match_name_pattern(handlers: typing.Mapping[str, typing.Any]) -> None:
+    name = re.compile(Term.NAME_PATTERN)
+    for key in handlers:
+        assert name.fullmatch(key), f"{key} must match {name.pattern}"
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Tests for :class:`module_name.spf.include_graph.IncludeGraph`."""
+
+import concurrent.futures
+import random
+import typing
+import pytest
+from module_name.spf.include_graph import (IncludeGraph, Network)
+from module_name.spf.limits import LOOKUP_LIMIT
+
+
+NET: Network = (32, 0xc0000200, 24)
+
+
+def graph(records: typing.Mapping[str, str]) -> IncludeGraph:
+    """Return an in-memory :class:`IncludeGraph` of `records`."""
+    result = IncludeGraph()
+    result.update_many(records.items())
+    return result
+
+
+def test_summary() -> None:
+    g = graph({
+        "a.example": "v=spf1 include:B.example. include:%{d}.example mx",
+        "b.example": "v=spf1 ip4:192.0.2.0/24 a",
+    })
+    summary = g.summary("A.example")
+    assert summary is not None
+    assert summary.lookups == 4
+    assert summary.networks == frozenset({NET})
+    assert g.summary("unknown.example") is None
+
+
+def test_deep_chain() -> None:
+    depth = 3000
+    g = graph({f"d{i}.example": f"v=spf1 include:d{i + 1}.example" for i in range(depth)})
+    g.update(f"d{depth}.example", "v=spf1 ip4:192.0.2.0/24")
+    assert g.lookup_count("d0.example") == depth
+    assert g.networks("d0.example") == frozenset({NET})
+
+
+def test_loop() -> None:
+    g = graph({
+        "l1.example": "v=spf1 include:l2.example",
+        "l2.example": "v=spf1 include:l1.example a",
+    })
+    count = g.lookup_count("l1.example")
+    assert count is not None and count > LOOKUP_LIMIT
+    g.update("l2.example", "v=spf1 a")
+    assert g.lookup_count("l1.example") == 2
+
+
+LOOP = {
+    "p.example": "v=spf1 ip4:192.0.2.0/24 include:l1.example",
+    "l1.example": "v=spf1 ip4:198.51.100.0/24 include:l2.example",
+    "l2.example": "v=spf1 a include:l3.example include:l1.example",
+    "l3.example": "v=spf1 include:l2.example",
+    "self.example": "v=spf1 ip4:192.0.2.0/24 include:self.example",
+    "ok.example": "v=spf1 include:self.example.org ip4:192.0.2.0/24",
+}
+
+
+@pytest.mark.parametrize('order', [sorted(LOOP), sorted(LOOP, reverse=True),
+                                   ["l2.example", "p.example", "l3.example", "l1.example"]])
+def test_loop_summaries_do_not_depend_on_order(order: typing.List[str]) -> None:
+    # everything reaching a loop gets the same summary
+    g = graph(LOOP)
+    for domain in order:
+        assert g.summary(domain) == ((1, frozenset({NET})) if domain == "ok.example"
+                                     else (LOOKUP_LIMIT + 1, frozenset()))
+
+
+@pytest.mark.parametrize('record,lookups,networks', [
+    ("v=spf1 redirect=r.example", 1, frozenset({NET})),
+    ("v=spf1 all redirect=r.example", 0, frozenset()),
+    ("v=spf1 include:r.example all redirect=r.example", 1, frozenset({NET})),
+])
+def test_redirect(record: str, lookups: int, networks: typing.FrozenSet[Network]) -> None:
+    g = graph({"d.example": record, "r.example": "v=spf1 ip4:192.0.2.0/24"})
+    assert g.lookup_count("d.example") == lookups
+    assert g.networks("d.example") == networks
+
+
+@pytest.mark.parametrize('record,lookups,networks', [
+    ("v=spf1 +ip4:192.0.2.0/24 mx/24 a/24//64 -all", 2, {NET}),
+    ("v=spf1 ip4:192.0.2.0/24 -ip4:198.51.100.0/24 ~ip6:2001:db8::/32 ?ip4:10.0.0.0/8 ~all",
+     0, {NET}),
+    ("v=spf1 include:i.example ~all", 1, {NET, (32, 0xc6336400, 24)}),
+    ("v=spf1 +include:i.example -all", 1, {NET, (32, 0xc6336400, 24)}),
+    ("v=spf1 -include:i.example ~include:i.example ?include:i.example", 3, set()),
+    ("v=spf1 -include:i.example redirect=i.example", 2, {NET, (32, 0xc6336400, 24)}),
+    ("v=spf1 -include:i.example -all redirect=i.example", 1, set()),
+])
+def test_qualifiers(record: str, lookups: int, networks: typing.Set[Network]) -> None:
+    g = graph({"d.example": record,
+               "i.example": "v=spf1 ip4:192.0.2.0/24 -ip4:203.0.113.0/24 ip4:198.51.100.0/24"
+                            " -all"})
+    assert g.lookup_count("d.example") == lookups
+    assert g.networks("d.example") == frozenset(networks)
+
+
+def test_networks_with_errors_are_skipped() -> None:
+    g = graph({"d.example": "v=spf1 ip4:192.0.2.0/024 ip4:192.0.2.0/33 ip6:2001:db8::/048 "
+                            "ip4:192.0.2.9/24"})
+    assert g.networks("d.example") == frozenset({NET})
+
+
+def test_updates_match_rebuild() -> None:
+    rng = random.Random(5)
+    domains = [f"d{i}.example" for i in range(60)]
+
+    def record() -> typing.Optional[str]:
+        if rng.random() < 0.1:
+            return None
+        terms = [f"{rng.choice(['', '-', '~'])}ip4:10.0.{rng.randrange(8)}.0/24"
+                 for _ in range(rng.randrange(3))]
+        terms += [f"{rng.choice(['', '+', '?'])}include:{rng.choice(domains)}"
+                  for _ in range(rng.randrange(3))]
+        if rng.random() < 0.3:
+            terms.append(f"redirect={rng.choice(domains)}")
+        if rng.random() < 0.3:
+            terms.append(rng.choice(["all", "-all", "~all"]))
+        return "v=spf1 " + " ".join(terms)
+
+    g = IncludeGraph()
+    for _ in range(20):
+        g.update_many((rng.choice(domains), record()) for _ in range(10))
+        # populate the memo before the next round of updates
+        summaries = [g.summary(domain) for domain in domains]
+    rebuilt = graph({d: r for d in domains for r in [g.record(d)] if r is not None})
+    # in a different order, which must not matter either
+    order = list(domains)
+    rng.shuffle(order)
+    expected = {domain: rebuilt.summary(domain) for domain in order}
+    assert summaries == [expected[domain] for domain in domains]
+
+
+def test_persistence(tmp_path: typing.Any) -> None:
+    path = str(tmp_path / "graph.sqlite")
+    g = IncludeGraph(path)
+    g.update_many([("a.example", "v=spf1 include:b.example"), ("b.example", "v=spf1 a"),
+                   ("c.example", "v=spf1 mx")])
+    g.update("c.example", None)
+    # set and removed, and removed and set, within a batch
+    g.update_many([("d.example", "v=spf1 a"), ("D.example", None),
+                   ("e.example", None), ("e.example", "v=spf1 mx"), ("e.example", "v=spf1 a")])
+    assert len(g) == 3
+    g.close()
+    g = IncludeGraph(path)
+    assert len(g) == 3
+    assert g.lookup_count("a.example") == 2
+    assert g.record("c.example") is None
+    assert g.record("d.example") is None
+    assert g.record("e.example") == "v=spf1 a"
+    g.close()
+
+
+def test_threads(tmp_path: typing.Any) -> None:
+    g = IncludeGraph(str(tmp_path / "graph.sqlite"))
+    g.update_many((f"p{i}.example", f"v=spf1 ip4:10.0.{i}.0/24") for i in range(10))
+
+    def work(worker: int) -> None:
+        for i in range(200):
+            g.update(f"c{worker}-{i}.example", f"v=spf1 include:p{i % 10}.example")
+            assert g.lookup_count(f"c{worker}-{i}.example") == 1
+            g.update(f"p{i % 10}.example", f"v=spf1 ip4:10.{worker}.{i % 10}.0/24")
+
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        list(executor.map(work, range(8)))
+    assert len(g) == 10 + 8 * 200
+    g.close()
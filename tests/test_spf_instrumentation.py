@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Tests for :mod:`module_name.spf.instrumentation`."""
+
+import typing
+import pytest
+from module_name import spf
+from module_name.spf import cidr_length, instrumentation
+
+
+RECORD = "v=spf1 ip4:192.0.2.0/24 mx:mx.example/24//64 include:_spf.example foo"
+
+
+def test_inactive_by_default() -> None:
+    assert instrumentation.active() is None
+
+
+def test_counts() -> None:
+    with instrumentation.collect() as collector:
+        spf.Parser.parse(RECORD)
+    assert instrumentation.active() is None
+    assert collector.terms == {'Version': 1, 'Spacing': 4, 'IP4Address': 1,
+                               'MailExchange': 1, 'Include': 1, 'Unknown': 1}
+    assert collector.errors == {'UnknownDirectiveError': 1}
+    assert set(collector.timings) == {'tokenize', 'classify', 'cidr-length'}
+    assert collector.calls['cidr-length'] == 2
+    assert not collector.cidr_lengths
+
+
+def test_standalone_cidr_lengths() -> None:
+    with instrumentation.collect() as collector:
+        cidr_length.DualCidrLengthParser.parse("/33//64")
+    assert not collector.terms
+    assert collector.cidr_lengths == {'dual-cidr-length': 1}
+    assert collector.errors == {'InvalidRangeError': 1}
+    assert 'spf_parser_cidr_lengths_total{kind="dual-cidr-length"} 1' \
+        in collector.prometheus().splitlines()
+
+
+def test_sampling() -> None:
+    with instrumentation.collect(sample_rate=0.0) as collector:
+        assert instrumentation.active() is None
+        spf.Parser.parse(RECORD)
+    assert not collector.terms
+
+
+def test_exception_keeps_phases_balanced(monkeypatch: typing.Any) -> None:
+    def fail(term: str) -> typing.NoReturn:
+        raise RuntimeError(term)
+
+    with instrumentation.collect() as collector:
+        with monkeypatch.context() as patch:
+            patch.setattr(spf.Parser, 'classify', fail)
+            with pytest.raises(RuntimeError):
+                spf.Parser.parse(RECORD)
+        assert collector.depth == 0
+        spf.Parser.parse(RECORD)
+    assert collector.terms['IP4Address'] == 1
+    assert sum(collector.latencies.counts) == 1
+
+
+def histogram(exposition: str) -> typing.Dict[str, float]:
+    """Return the record latency histogram samples of `exposition` by name and label."""
+    return {name: float(value) for name, value in
+            (line.rsplit(" ", 1) for line in exposition.splitlines())
+            if name.startswith('spf_parser_record_seconds_')}
+
+
+def test_merged_histogram() -> None:
+    records = [RECORD, "v=spf1 -all", "v=spf1 a/24 mx ~all", ""]
+    first = instrumentation.Collector()
+    second = instrumentation.Collector()
+    for i, record in enumerate(records * 5):
+        with instrumentation.collect(first if i % 2 else second):
+            spf.Parser.parse(record)
+    merged = instrumentation.Collector()
+    merged.merge(first)
+    merged.merge(second)
+
+    assert merged.terms == first.terms + second.terms
+    assert merged.terms['All'] == 10
+    samples = histogram(merged.prometheus())
+    buckets = [samples[f'spf_parser_record_seconds_bucket{{le="{le}"}}']
+               for le in [repr(b) for b in merged.LATENCY_BUCKETS] + ["+Inf"]]
+    assert len(samples) == len(buckets) + 2
+    assert buckets == sorted(buckets)
+    assert buckets[-1] == samples['spf_parser_record_seconds_count'] == 20
+    assert samples['spf_parser_record_seconds_sum'] == pytest.approx(
+        first.latencies.sum + second.latencies.sum)
+    assert 0 < samples['spf_parser_record_seconds_sum'] < 20
+
+
+def test_histogram_buckets() -> None:
+    collector = instrumentation.Collector()
+    for seconds in (5e-6, 10e-6, 11e-6, 1e-3, 1.0):
+        collector.observe(seconds)
+    samples = histogram(collector.prometheus())
+    assert samples['spf_parser_record_seconds_bucket{le="1e-05"}'] == 2
+    assert samples['spf_parser_record_seconds_bucket{le="2.5e-05"}'] == 3
+    assert samples['spf_parser_record_seconds_bucket{le="0.001"}'] == 4
+    assert samples['spf_parser_record_seconds_bucket{le="0.01"}'] == 4
+    assert samples['spf_parser_record_seconds_bucket{le="+Inf"}'] == 5
+    assert samples['spf_parser_record_seconds_count'] == 5
+    assert samples['spf_parser_record_seconds_sum'] == pytest.approx(1.001026)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Tests for :mod:`module_name.spf.ip_address` and the "ip4"/"ip6" directives."""
+
+import ipaddress
+import random
+import typing
+import pytest
+from module_name import spf
+from module_name.spf.directive import (IP4Address, IP6Address, IPNetwork)
+from module_name.spf.ip_address import (parse_ip4, parse_ip6)
+
+
+def reference(parse: typing.Callable[[str], typing.Any], string: str) -> typing.Optional[int]:
+    """Parse `string` with :mod:`ipaddress`."""
+    try:
+        return int(parse(string))
+    except ValueError:
+        return None
+
+
+def mutate(rng: random.Random, string: str) -> str:
+    """Insert, delete or replace a few characters of `string`."""
+    chars = list(string)
+    for _ in range(rng.randrange(1, 3)):
+        index = rng.randrange(len(chars) + 1)
+        char = rng.choice("0123456789abcdefABCDEF:.")
+        operation = rng.randrange(3)
+        if operation == 0:
+            chars.insert(index, char)
+        elif index < len(chars):
+            if operation == 1:
+                del chars[index]
+            else:
+                chars[index] = char
+    return "".join(chars)
+
+
+def corpus(count: int) -> typing.Iterator[typing.Tuple[str, str]]:
+    """Generate valid and mostly invalid (ip4, ip6) strings."""
+    rng = random.Random(5)
+    for _ in range(count):
+        ip4 = str(ipaddress.IPv4Address(rng.getrandbits(32)))
+        # sparse addresses, so that "::" shows up in all positions
+        ip6 = ipaddress.IPv6Address(rng.getrandbits(128) if rng.random() < 0.5
+                                    else rng.getrandbits(16) << rng.choice([0, 16, 64, 112]))
+        ip6_str = rng.choice([str(ip6), ip6.exploded, "::ffff:" + ip4])
+        yield ip4, ip6_str
+        yield mutate(rng, ip4), mutate(rng, ip6_str)
+
+
+def test_corpus_matches_ipaddress() -> None:
+    for ip4, ip6 in corpus(20000):
+        assert parse_ip4(ip4) == reference(ipaddress.IPv4Address, ip4), ip4
+        assert parse_ip6(ip6) == reference(ipaddress.IPv6Address, ip6), ip6
+
+
+@pytest.mark.parametrize('string,expected', [
+    ("192.0.2.1", 0xc0000201),
+    ("0.0.0.0", 0),
+    ("255.255.255.255", 0xffffffff),
+    ("192.0.2.01", None),
+    ("192.0.2.00", None),
+    ("192.0.2.256", None),
+    ("192.0.2", None),
+    ("192.0.2.1.", None),
+    ("192.0.2.+1", None),
+    ("192.0.2.١", None),
+    ("", None),
+])
+def test_ip4(string: str, expected: typing.Optional[int]) -> None:
+    assert parse_ip4(string) == expected
+
+
+@pytest.mark.parametrize('string,expected', [
+    ("::", 0),
+    ("::1", 1),
+    ("1:2:3:4:5:6:7::", 0x00010002000300040005000600070000),
+    ("::2:3:4:5:6:7:8", 0x00000002000300040005000600070008),
+    ("1::2:3:4:5:6:7:8", None),
+    ("1:2:3:4:5:6:7:8::", None),
+    ("1:2:3:4:5:6:7:8", 0x00010002000300040005000600070008),
+    ("1:2:3:4:5:6:7", None),
+    ("1::2::3", None),
+    (":::", None),
+    ("1:", None),
+    (":1", None),
+    ("00001::", None),
+    ("::ffff:192.0.2.1", 0xffffc0000201),
+    ("1:2:3:4:5:6:192.0.2.1", 0x000100020003000400050006c0000201),
+    ("::ffff:192.0.2.01", None),
+    ("192.0.2.1::", None),
+    ("::192.0.2.1:1", None),
+    ("1:2:3:4:5:6:7:192.0.2.1", None),
+    ("fe80::1%eth0", None),
+    ("fe80::1%1", None),
+])
+def test_ip6(string: str, expected: typing.Optional[int]) -> None:
+    assert parse_ip6(string) == expected
+
+
+def network(term: str) -> IPNetwork:
+    """Parse a single "ip4"/"ip6" directive."""
+    directive = spf.Parser.parse(f"v=spf1 {term}").terms[-1]
+    assert isinstance(directive, IPNetwork)
+    return directive
+
+
+@pytest.mark.parametrize('term,cls,network_,prefix_length', [
+    ("ip4:192.0.2.1", IP4Address, 0xc0000201, 32),
+    ("ip4:192.0.2.129/25", IP4Address, 0xc0000280, 25),
+    ("ip4:192.0.2.1/0", IP4Address, 0, 0),
+    ("ip6:2001:db8::1", IP6Address, 0x20010db8000000000000000000000001, 128),
+    ("ip6:2001:db8::1/32", IP6Address, 0x20010db8 << 96, 32),
+    ("ip6:::ffff:192.0.2.1/120", IP6Address, 0xffffc0000200, 120),
+])
+def test_network(term: str, cls: typing.Type[IPNetwork], network_: int,
+                 prefix_length: int) -> None:
+    directive = network(term)
+    assert isinstance(directive, cls)
+    assert not list(directive.errors)
+    assert directive.network == network_
+    assert directive.prefix_length == prefix_length
+
+
+@pytest.mark.parametrize('term', [
+    "ip4", "ip4:", "ip4:192.0.2.01", "ip4:2001:db8::", "ip6:192.0.2.1", "ip6:fe80::1%eth0",
+])
+def test_invalid_network(term: str) -> None:
+    directive = network(term)
+    assert list(directive.errors)
+    assert directive.network is None
+    assert directive.prefix_length is None
+
+
+@pytest.mark.parametrize('term,prefix_length', [
+    ("ip4:192.0.2.0/33", 32),
+    ("ip6:2001:db8::/129", 128),
+])
+def test_invalid_prefix_length(term: str, prefix_length: int) -> None:
+    # the cidr-length parser reports the error and clamps the value
+    directive = network(term)
+    assert list(directive.errors)
+    assert directive.prefix_length == prefix_length
+
+
+@pytest.mark.parametrize('term,address,expected', [
+    ("ip4:192.0.2.0/24", "192.0.2.255", True),
+    ("ip4:192.0.2.0/24", "192.0.3.0", False),
+    ("ip4:192.0.2.1", "192.0.2.1", True),
+    ("ip4:192.0.2.1", "192.0.2.2", False),
+    ("ip4:0.0.0.0/0", "203.0.113.7", True),
+    ("ip6:2001:db8::/32", "2001:db8:ffff::1", True),
+    ("ip6:2001:db8::/32", "2001:db9::", False),
+    ("ip6:::ffff:192.0.2.0/120", "::ffff:192.0.2.77", True),
+])
+def test_match(term: str, address: str, expected: bool) -> None:
+    assert network(term).match(int(ipaddress.ip_address(address))) is expected
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Tests for :mod:`module_name.spf.lookup`."""
+
+import asyncio
+import ipaddress
+import typing
+import pytest
+from module_name.spf import lookup
+
+
+IP4 = int(ipaddress.IPv4Address("192.0.2.10"))
+IP6 = int(ipaddress.IPv6Address("2001:db8::10"))
+
+Answer = typing.Union[typing.Sequence[str], Exception]
+
+
+class StubResolver():
+    """A resolver answering from a table, with injectable latency."""
+    def __init__(self, answers: typing.Mapping[typing.Tuple[str, str], Answer],
+                 delays: typing.Optional[typing.Mapping[str, float]] = None) -> None:
+        """Create a :class:`StubResolver`.
+
+        `answers` are the answers (or the exception to raise) by (name, type);
+        other queries get no answers.
+        `delays` are the latencies by name in seconds.
+        """
+        self.answers = answers
+        self.delays = delays or {}
+        self.queries: typing.List[typing.Tuple[str, str]] = []
+        self.cancelled: typing.List[str] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def query(self, name: str, rdtype: str) -> typing.Sequence[str]:
+        self.queries.append((name, rdtype))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(name, 0.0))
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        finally:
+            self.running -= 1
+        answer = self.answers.get((name, rdtype), [])
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+def mx(names: typing.Sequence[str], addresses: typing.Mapping[str, Answer],
+       delays: typing.Optional[typing.Mapping[str, float]] = None) -> StubResolver:
+    """Return a resolver for example.org with MX `names` and their A `addresses`."""
+    answers: typing.Dict[typing.Tuple[str, str], Answer] = {("example.org", "MX"): names}
+    answers.update(((name, "A"), answer) for name, answer in addresses.items())
+    return StubResolver(answers, delays)
+
+
+def mx_match(resolver: StubResolver, evaluation: typing.Optional[lookup.Evaluation] = None,
+             address: int = IP4, prefix_length: typing.Optional[int] = None) -> bool:
+    """Run :func:`lookup.mx_match` for example.org."""
+    if evaluation is None:
+        evaluation = lookup.Evaluation(resolver)
+    return asyncio.run(lookup.mx_match(evaluation, "example.org", address, 32, prefix_length))
+
+
+def test_mx_match_cancels_the_rest() -> None:
+    names = [f"mx{i}.example.org" for i in range(5)]
+    resolver = mx(names, {"mx0.example.org": ["192.0.2.1"], "mx1.example.org": ["192.0.2.10"],
+                          "mx2.example.org": ["192.0.2.2"]},
+                  {"mx3.example.org": 10.0, "mx4.example.org": 10.0})
+    assert mx_match(resolver)
+    assert resolver.cancelled == ["mx3.example.org", "mx4.example.org"]
+    assert resolver.max_running == 5
+
+
+def test_mx_no_match() -> None:
+    resolver = mx(["a.example.org", "b.example.org"],
+                  {"a.example.org": ["192.0.2.1"], "b.example.org": ["192.0.2.11", "bogus"]})
+    assert not mx_match(resolver)
+    assert mx_match(resolver, prefix_length=24)
+
+
+def test_mx_ip6() -> None:
+    resolver = StubResolver({("example.org", "MX"): ["a.example.org"],
+                             ("a.example.org", "A"): ["192.0.2.10"],
+                             ("a.example.org", "AAAA"): ["2001:db8::10"]})
+    evaluation = lookup.Evaluation(resolver)
+    assert asyncio.run(lookup.mx_match(evaluation, "example.org", IP6, 128))
+    assert resolver.queries[-1] == ("a.example.org", "AAAA")
+
+
+def test_mx_limit() -> None:
+    resolver = mx([f"mx{i}.example.org" for i in range(11)], {})
+    with pytest.raises(lookup.LimitError) as info:
+        mx_match(resolver)
+    assert info.value.kind == "MX names"
+    # none of the addresses is looked up
+    assert resolver.queries == [("example.org", "MX")]
+
+
+def test_concurrency_cap() -> None:
+    names = [f"mx{i}.example.org" for i in range(10)]
+    resolver = mx(names, {name: ["192.0.2.1"] for name in names},
+                  {name: 0.01 for name in names})
+    assert not mx_match(resolver, lookup.Evaluation(resolver, max_concurrency=3))
+    assert resolver.max_running == 3
+
+
+@pytest.mark.parametrize('delays', [{}, {"v0.example.org": 0.05, "v1.example.org": 0.05}],
+                         ids=['in-order', 'match-first'])
+def test_void_lookups_are_counted_in_order(delays: typing.Dict[str, float]) -> None:
+    # the match comes after three void lookups, however fast it is answered
+    names = ["v0.example.org", "v1.example.org", "v2.example.org", "m.example.org"]
+    resolver = mx(names, {"m.example.org": ["192.0.2.10"]}, delays)
+    with pytest.raises(lookup.LimitError) as info:
+        mx_match(resolver)
+    assert info.value.kind == "void lookups"
+
+    resolver = mx(names[1:], {"m.example.org": ["192.0.2.10"]}, delays)
+    evaluation = lookup.Evaluation(resolver)
+    assert mx_match(resolver, evaluation)
+    assert evaluation.void_lookups == 2
+
+
+def test_void_lookups_after_a_match_are_not_counted() -> None:
+    resolver = mx(["m.example.org", "v0.example.org", "v1.example.org", "v2.example.org"],
+                  {"m.example.org": ["192.0.2.10"]}, {"m.example.org": 0.05})
+    evaluation = lookup.Evaluation(resolver)
+    assert mx_match(resolver, evaluation)
+    assert evaluation.void_lookups == 0
+
+
+def test_mx_errors() -> None:
+    resolver = mx(["a.example.org", "b.example.org"],
+                  {"a.example.org": lookup.DNSError(), "b.example.org": ["192.0.2.10"]})
+    with pytest.raises(lookup.DNSError):
+        mx_match(resolver)
+    # an error after the match does not matter
+    resolver = mx(["b.example.org", "a.example.org"],
+                  {"a.example.org": lookup.DNSError(), "b.example.org": ["192.0.2.10"]},
+                  {"b.example.org": 0.05})
+    assert mx_match(resolver)
+
+
+def test_no_mx_is_a_void_lookup() -> None:
+    resolver = StubResolver({("example.org", "A"): ["192.0.2.10"]})
+    evaluation = lookup.Evaluation(resolver)
+    assert not mx_match(resolver, evaluation)
+    assert evaluation.void_lookups == 1
+    # no implicit MX
+    assert resolver.queries == [("example.org", "MX")]
+
+
+def test_lookup_limit() -> None:
+    resolver = mx(["a.example.org"], {"a.example.org": ["192.0.2.1"]})
+
+    async def evaluate() -> lookup.Evaluation:
+        evaluation = lookup.Evaluation(resolver)
+        for _ in range(10):
+            assert not await lookup.mx_match(evaluation, "example.org", IP4, 32)
+        with pytest.raises(lookup.LimitError) as info:
+            await lookup.mx_match(evaluation, "example.org", IP4, 32)
+        assert info.value.kind == "DNS lookups"
+        return evaluation
+
+    assert asyncio.run(evaluate()).lookups == 11
+
+
+@pytest.mark.parametrize('address', ["192.0.2.10", "0.0.0.1", "2001:db8::10", "::1"])
+def test_reverse_name(address: str) -> None:
+    ip = ipaddress.ip_address(address)
+    assert lookup.reverse_name(int(ip), ip.max_prefixlen) == ip.reverse_pointer
+
+
+def ptr(names: Answer, addresses: typing.Mapping[str, Answer]) -> StubResolver:
+    """Return a resolver with PTR `names` for :data:`IP4` and their A `addresses`."""
+    answers: typing.Dict[typing.Tuple[str, str], Answer] = \
+        {("10.2.0.192.in-addr.arpa", "PTR"): names}
+    answers.update(((name, "A"), answer) for name, answer in addresses.items())
+    return StubResolver(answers)
+
+
+def ptr_match(resolver: StubResolver, domain: str = "example.org") -> bool:
+    """Run :func:`lookup.ptr_match` for :data:`IP4`."""
+    return asyncio.run(lookup.ptr_match(lookup.Evaluation(resolver), domain, IP4, 32))
+
+
+def test_ptr_match() -> None:
+    resolver = ptr(["mail.example.com", "mail.example.org."],
+                   {"mail.example.com": ["192.0.2.10"], "mail.example.org.": ["192.0.2.10"]})
+    assert ptr_match(resolver)
+    assert ptr_match(resolver, "Mail.Example.org")
+    assert not ptr_match(resolver, "il.example.org")
+    # names outside the domain are not forward-confirmed
+    assert ("mail.example.com", "A") not in resolver.queries
+
+
+def test_ptr_unconfirmed() -> None:
+    resolver = ptr(["mail.example.org"], {"mail.example.org": ["192.0.2.11"]})
+    assert not ptr_match(resolver)
+
+
+def test_ptr_limit() -> None:
+    names = [f"n{i}.example.org" for i in range(11)]
+    addresses = {name: ["192.0.2.1"] for name in names}
+    assert not ptr_match(ptr(names, dict(addresses, **{names[10]: ["192.0.2.10"]})))
+    assert ptr_match(ptr(names, dict(addresses, **{names[9]: ["192.0.2.10"]})))
+
+
+def test_ptr_errors() -> None:
+    assert not ptr_match(ptr(lookup.DNSError(), {}))
+    resolver = ptr(["a.example.org", "b.example.org"],
+                   {"a.example.org": lookup.DNSError(), "b.example.org": ["192.0.2.10"]})
+    assert ptr_match(resolver)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Tests for :mod:`module_name.spf.macro` and :meth:`module_name.spf.SPF.macro_letters`."""
+
+import typing
+import pytest
+from module_name import spf
+from module_name.spf.macro import macro_letters
+
+
+@pytest.mark.parametrize('string,letters', [
+    ("example.org", ""),
+    ("%{d}", "d"),
+    ("%{S}.%{L}", "sl"),
+    ("%{ir}.%{v}._spf.%{d2}", "ivd"),
+    ("%{l1r-}.%{o}", "lo"),
+    ("%%{s}", ""),
+    ("%_%{h}%-", "h"),
+    ("%%%{p}", "p"),
+    ("100%", ""),
+    ("%{", ""),
+])
+def test_macro_letters(string: str, letters: str) -> None:
+    assert macro_letters(string) == frozenset(letters)
+
+
+@pytest.mark.parametrize('record,letters', [
+    ("v=spf1 ip4:192.0.2.1 -all", ""),
+    ("v=spf1 exists:%{ir}.%{l1r+-}._spf.%{d} -all", "ild"),
+    ("v=spf1 a:%{H} mx/24 ?include:%{o}.x", "ho"),
+    ("v=spf1 -all exp=%{s}.explain.%{d}", "sd"),
+    ("v=spf1 redirect=%{d2}._spf.%{i}", "di"),
+    ("v=spf1 include:%%{s}.x redirect=%_%-", ""),
+])
+def test_spf_macro_letters(record: str, letters: typing.Iterable[str]) -> None:
+    assert spf.Parser.parse(record).macro_letters() == frozenset(letters)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Tests for :class:`module_name.spf.SPF`."""
+
+import typing
+import pytest
+from module_name import spf
+
+
+@pytest.mark.parametrize('record,count', [
+    ("v=spf1 ip4:192.0.2.1 all", 0),
+    ("v=spf1 a mx ptr exists:x include:y ip4:192.0.2.1 exp=e", 5),
+    ("v=spf1 include:y redirect=z", 2),
+    ("v=spf1 all redirect=z", 0),
+    ("v=spf1 include:y all redirect=z", 1),
+    ("v=spf1 include:y -all redirect=z", 1),
+    ("v=spf1 include:y ~all redirect=z", 1),
+    ("v=spf1 ?include:y redirect=z", 2),
+    ("v=spf1 mx/24 a/24//64 -a:x/16 +ip4:192.0.2.0/24 -all", 3),
+])
+def test_lookup_count(record: str, count: int) -> None:
+    assert spf.Parser.parse(record).lookup_count() == count
+
+
+@pytest.mark.parametrize('record,applies', [
+    ("v=spf1 redirect=r", True),
+    ("v=spf1 all redirect=r", False),
+    ("v=spf1 -all redirect=r", False),
+    ("v=spf1 ~all redirect=r", False),
+    ("v=spf1 -allx redirect=r", True),
+])
+def test_redirect_applies(record: str, applies: bool) -> None:
+    assert spf.Parser.parse(record).redirect_applies is applies
+
+
+@pytest.mark.parametrize('record,targets', [
+    ("v=spf1 redirect=r a mx:m/24 include:%{d}.x include:i a:/24 ptr:p",
+     ["m", "i", "r"]),
+    ("v=spf1 include:i all redirect=r", ["i"]),
+    ("v=spf1 include:a -all redirect=b", ["a"]),
+    ("v=spf1 ~include:a ?all redirect=b", ["a"]),
+    ("v=spf1 mx/24 -mx:m/24 ~a:a redirect=r", ["m", "a", "r"]),
+])
+def test_prefetch_targets(record: str, targets: typing.List[str]) -> None:
+    assert [name for _, name in spf.Parser.parse(record).prefetch_targets()] == targets
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Stress test parsing from many threads."""
+
+import concurrent.futures
+import typing
+import pytest
+from module_name import spf
+
+
+CORPUS = [
+    f"v=spf1 ip4:10.{i % 256}.0.0/{8 + i % 25} ip6:2001:db8::{i:x}/64 a:h{i}.example/24//64 "
+    f"mx foo{i}:bar include:_s{i}.example exists:%{{i}}.{i}.example "
+    f"redirect=r{i}.example unknown{i}=v ip4:1.2.3.{i % 300} ~all"
+    for i in range(2000)
+]
+
+
+def summarize(record: str) -> typing.List[typing.Tuple[typing.Any, ...]]:
+    """Parse `record` into something comparable."""
+    return [(term.__class__.__name__, str(term),
+             getattr(term, 'network', None), getattr(term, 'prefix_length', None),
+             getattr(term, 'domain_spec', None),
+             tuple(error.__class__.__name__ for error in term.errors))
+            for term in spf.Parser.parse(record).terms]
+
+
+@pytest.mark.parametrize('threads', [2, 8, 32])
+def test_threads_match_single_threaded(threads: int) -> None:
+    expected = [summarize(record) for record in CORPUS]
+    with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(summarize, CORPUS * 3))
+    assert results == expected * 3